@@ -9,7 +9,6 @@ from flask_cors import CORS
 from werkzeug.utils import secure_filename
 from dotenv import load_dotenv
 import traceback
-import tempfile
 from datetime import datetime
 
 from ade_api import LandingAIClient
@@ -404,22 +403,17 @@ def download_word():
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         filename = f"credit_memo_{safe_name}_{timestamp}.docx"
 
-        # Create temporary file
-        temp_dir = tempfile.gettempdir()
-        output_path = os.path.join(temp_dir, filename)
-
-        # Generate Word document
-        generate_credit_memo_docx(
+        # Generate Word document in memory (no temporary file to write, re-read or clean up)
+        output = generate_credit_memo_docx(
             extracted_data=financial_data,
             ratios=ratios,
             memo_narrative=memo_text,
-            borrower_info=borrower_info,
-            output_filename=output_path
+            borrower_info=borrower_info
         )
 
         # Send file
         return send_file(
-            output_path,
+            output,
             as_attachment=True,
             download_name=filename,
             mimetype='application/vnd.openxmlformats-officedocument.wordprocessingml.document'
@@ -494,19 +488,15 @@ def test_word():
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         filename = f"test_credit_memo_{safe_name}_{timestamp}.docx"
 
-        temp_dir = tempfile.gettempdir()
-        output_path = os.path.join(temp_dir, filename)
-
-        generate_credit_memo_docx(
+        output = generate_credit_memo_docx(
             extracted_data=test_data['financial_data'],
             ratios=test_data['ratios'],
             memo_narrative=test_data['memo'],
-            borrower_info=test_data['borrower_info'],
-            output_filename=output_path
+            borrower_info=test_data['borrower_info']
         )
 
         return send_file(
-            output_path,
+            output,
             as_attachment=True,
             download_name=filename,
             mimetype='application/vnd.openxmlformats-officedocument.wordprocessingml.document'
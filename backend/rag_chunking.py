@@ -5,9 +5,129 @@ Handles chunking of credit memo narratives and embedding generation
 
 import pandas as pd
 import os
-from typing import List, Dict, Any, Optional
+import json
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import List, Dict, Any, Iterator, Optional, Tuple
 from sentence_transformers import SentenceTransformer
 import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+import torch
+
+
+def resolve_device(device: Optional[str] = None) -> str:
+    """
+    Pick the torch device for embedding inference
+
+    Args:
+        device: Explicit device ('cuda', 'cpu', ...) or None to auto-detect
+
+    Returns:
+        Device name, 'cuda' when a GPU is available and none was given
+    """
+    if device:
+        return device
+    return 'cuda' if torch.cuda.is_available() else 'cpu'
+
+
+def resolve_backend(backend: Optional[str] = None) -> str:
+    """
+    Pick the inference backend for the embedding model
+
+    Args:
+        backend: 'torch', 'onnx' or 'openvino', or None to use the
+                 EMBEDDING_BACKEND env var (default: 'torch')
+
+    Returns:
+        Backend name
+    """
+    return backend or os.getenv('EMBEDDING_BACKEND', 'torch')
+
+
+@lru_cache(maxsize=4)
+def load_embedding_model(
+    model_name: str,
+    device: str = 'cpu',
+    backend: str = 'torch'
+) -> SentenceTransformer:
+    """
+    Load a sentence transformer model once per process and reuse it
+
+    Args:
+        model_name: Sentence transformer model name
+        device: Torch device (see resolve_device)
+        backend: Inference backend (see resolve_backend). 'onnx' runs the
+                 model through ONNX Runtime and requires sentence-transformers
+                 >= 3.2 with optimum[onnxruntime] installed
+
+    Returns:
+        Shared SentenceTransformer instance in eval mode
+    """
+    if device == 'cpu':
+        # Use every core for intra-op parallelism (override with EMBEDDING_NUM_THREADS)
+        torch.set_num_threads(int(os.getenv('EMBEDDING_NUM_THREADS', os.cpu_count() or 1)))
+
+    # Request the Rust-backed tokenizer explicitly
+    # (tokenizer_kwargs needs sentence-transformers >= 3.0)
+    tokenizer_kwargs = {'use_fast': True}
+
+    if backend == 'torch':
+        model = SentenceTransformer(model_name, device=device, tokenizer_kwargs=tokenizer_kwargs)
+    else:
+        # Exported to ONNX/OpenVINO on first load if the repo has no exported model
+        model = SentenceTransformer(
+            model_name, device=device, backend=backend, tokenizer_kwargs=tokenizer_kwargs
+        )
+    model.eval()
+
+    if not getattr(model.tokenizer, 'is_fast', False):
+        print(f"⚠ {model_name} has no fast tokenizer; tokenization will run in Python")
+
+    return model
+
+
+@contextmanager
+def inference_context(device: str) -> Iterator[None]:
+    """
+    Disable autograd for encoding and run in FP16 autocast on CUDA
+
+    Args:
+        device: Device the model runs on
+    """
+    with torch.inference_mode():
+        if device.startswith('cuda'):
+            with torch.autocast('cuda', dtype=torch.float16):
+                yield
+        else:
+            yield
+
+
+def quantize_embeddings_int8(
+    embeddings: np.ndarray,
+    ranges: Optional[np.ndarray] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Scalar-quantize float embeddings to int8, one scale per dimension
+
+    Args:
+        embeddings: Float matrix of shape (N, D)
+        ranges: Per-dimension [min, max] of shape (2, D) from a calibration set
+                (default: computed from embeddings)
+
+    Returns:
+        Tuple of (int8 matrix, ranges); keep the ranges to quantize queries
+        onto the same grid
+    """
+    if ranges is None:
+        ranges = np.vstack((embeddings.min(axis=0), embeddings.max(axis=0)))
+
+    starts = ranges[0]
+    steps = (ranges[1] - ranges[0]) / 255
+    steps[steps == 0] = 1.0  # Constant dimensions map to a single bucket
+
+    buckets = np.clip((embeddings - starts) / steps, 0, 255)
+    return (buckets - 128).astype(np.int8), ranges
 
 
 class TextChunker:
@@ -28,28 +148,38 @@ class TextChunker:
         if not text or len(text) <= max_length:
             return [text] if text else []
 
-        # Split by sentences
-        sentences = text.split('. ')
+        # Scan sentence boundaries ('. ') in one pass and slice chunks out of
+        # the original text instead of splitting and re-concatenating
         chunks = []
-        current = ""
-
-        for sentence in sentences:
-            # Add period back if it was removed
-            if not sentence.endswith('.'):
-                sentence += '.'
+        find = text.find
+        ends_with_period = text.endswith('.')
+        text_length = len(text)
+        start = 0  # Start of the chunk being accumulated
+        pos = 0    # Start of the next sentence
+
+        while True:
+            boundary = find('. ', pos)
+            if boundary == -1:
+                # Last sentence; a period is added if the text lacks one
+                sentence_end = text_length + (0 if ends_with_period else 1)
+            else:
+                sentence_end = boundary + 1
 
             # Check if adding this sentence exceeds max_length
-            if len(current) + len(sentence) < max_length:
-                current += sentence + " "
-            else:
+            if sentence_end - start >= max_length and pos > start:
                 # Save current chunk and start new one
-                if current:
-                    chunks.append(current.strip())
-                current = sentence + " "
+                chunks.append(text[start:pos].strip())
+                start = pos
+
+            if boundary == -1:
+                break
+            pos = boundary + 2
 
         # Add remaining text
-        if current:
-            chunks.append(current.strip())
+        tail = text[start:]
+        if not ends_with_period:
+            tail += '.'
+        chunks.append(tail.strip())
 
         return chunks
 
@@ -74,36 +204,59 @@ class TextChunker:
         Returns:
             New DataFrame with chunked text
         """
-        chunked_records = []
-
-        for _, row in df.iterrows():
-            text = row[text_column]
-            chunks = TextChunker.chunk_text(text, max_length=max_length)
+        # Build the output column by column rather than as a list of dicts
+        chunk_ids = []
+        original_ids = []
+        chunk_indices = []
+        chunk_texts = []
+        source_rows = []
+
+        # Pull columns out as arrays once instead of boxing each row into a Series
+        texts = df[text_column].to_numpy()
+        ids = df[id_column].to_numpy()
+        chunk_text = TextChunker.chunk_text
+
+        for i in range(len(df)):
+            row_id = ids[i]
+            chunks = chunk_text(texts[i], max_length=max_length)
 
             for idx, chunk in enumerate(chunks):
-                record = {
-                    'chunk_id': f"{row[id_column]}-{idx+1}",
-                    'original_id': row[id_column],
-                    'chunk_index': idx + 1,
-                    'chunk_text': chunk,
-                    'chunk_length': len(chunk)
-                }
+                chunk_ids.append(f"{row_id}-{idx+1}")
+                original_ids.append(row_id)
+                chunk_indices.append(idx + 1)
+                chunk_texts.append(chunk)
+                source_rows.append(i)
+
+        data = {
+            'chunk_id': chunk_ids,
+            'original_id': original_ids,
+            'chunk_index': chunk_indices,
+            'chunk_text': chunk_texts
+        }
 
-                # Add additional columns
-                if additional_columns:
-                    for col in additional_columns:
-                        if col in row:
-                            record[col] = row[col]
+        # Add additional columns, repeated once per chunk of their source row
+        for col in additional_columns or []:
+            if col in df.columns:
+                data[col] = df[col].to_numpy()[source_rows]
 
-                chunked_records.append(record)
+        df_chunks = pd.DataFrame(data)
 
-        return pd.DataFrame(chunked_records)
+        # Compute lengths in one vectorized pass, placed right after chunk_text
+        # (the object cast keeps .str usable when there are no chunks)
+        df_chunks.insert(4, 'chunk_length', df_chunks['chunk_text'].astype(object).str.len())
+
+        return df_chunks
 
 
 class EmbeddingGenerator:
     """Handles embedding generation for semantic search"""
 
-    def __init__(self, model_name: str = 'all-mpnet-base-v2'):
+    def __init__(
+        self,
+        model_name: str = 'all-mpnet-base-v2',
+        device: Optional[str] = None,
+        backend: Optional[str] = None
+    ):
         """
         Initialize embedding generator
 
@@ -113,9 +266,13 @@ class EmbeddingGenerator:
                          - 'all-mpnet-base-v2': Best quality (768 dims)
                          - 'all-MiniLM-L6-v2': Fast and efficient (384 dims)
                          - 'all-distilroberta-v1': Good balance (768 dims)
+            device: Torch device (default: cuda if available, else cpu)
+            backend: Inference backend, 'torch' or 'onnx' (default: EMBEDDING_BACKEND or 'torch')
         """
-        print(f"Loading embedding model: {model_name}...")
-        self.model = SentenceTransformer(model_name)
+        self.device = resolve_device(device)
+        self.backend = resolve_backend(backend)
+        print(f"Loading embedding model: {model_name} ({self.device}, {self.backend})...")
+        self.model = load_embedding_model(model_name, self.device, self.backend)
         self.model_name = model_name
         self.embedding_dim = self.model.get_sentence_embedding_dimension()
         print(f"✓ Model loaded. Embedding dimension: {self.embedding_dim}")
@@ -133,41 +290,53 @@ class EmbeddingGenerator:
         if not text:
             return [0.0] * self.embedding_dim
 
-        embedding = self.model.encode(text, convert_to_numpy=True)
-        return embedding.tolist()
+        with inference_context(self.device):
+            embedding = self.model.encode(text, convert_to_numpy=True, normalize_embeddings=True)
+        return embedding.astype(np.float32, copy=False).tolist()
 
     def generate_embeddings_batch(
         self,
         texts: List[str],
         batch_size: int = 32,
         show_progress: bool = True
-    ) -> List[List[float]]:
+    ) -> np.ndarray:
         """
         Generate embeddings for multiple texts efficiently
 
         Args:
             texts: List of input texts
             batch_size: Batch size for processing
-            show_progress: Show progress bar
+            show_progress: Show progress bar and status messages
 
         Returns:
-            List of embedding vectors
+            Unit-norm embedding matrix of shape (len(texts), embedding_dim), float32
         """
         if not texts:
-            return []
+            return np.empty((0, self.embedding_dim), dtype=np.float32)
 
-        print(f"Generating embeddings for {len(texts)} texts...")
+        if show_progress:
+            print(f"Generating embeddings for {len(texts)} texts...")
 
-        embeddings = self.model.encode(
-            texts,
-            batch_size=batch_size,
-            show_progress_bar=show_progress,
-            convert_to_numpy=True
-        )
+        # Encode in length order so each batch pads to a similar length,
+        # then scatter the rows back to the caller's order
+        order = np.argsort([len(text) for text in texts], kind='stable')
+
+        with inference_context(self.device):
+            sorted_embeddings = self.model.encode(
+                [texts[i] for i in order],
+                batch_size=batch_size,
+                show_progress_bar=show_progress,
+                convert_to_numpy=True,
+                normalize_embeddings=True
+            )
 
-        print(f"✓ Generated {len(embeddings)} embeddings")
+        embeddings = np.empty(sorted_embeddings.shape, dtype=np.float32)
+        embeddings[order] = sorted_embeddings
 
-        return embeddings.tolist()
+        if show_progress:
+            print(f"✓ Generated {len(embeddings)} embeddings")
+
+        return embeddings
 
     def add_embeddings_to_dataframe(
         self,
@@ -186,7 +355,7 @@ class EmbeddingGenerator:
             batch_size: Batch size for processing
 
         Returns:
-            DataFrame with embeddings added
+            DataFrame with embeddings added (one float32 row view per cell)
         """
         texts = df[text_column].fillna('').tolist()
 
@@ -196,18 +365,77 @@ class EmbeddingGenerator:
             show_progress=True
         )
 
-        df[embedding_column] = embeddings
+        # Each cell is a view into the embedding matrix, not a copied list
+        df[embedding_column] = list(embeddings)
 
         return df
 
 
+def _stream_embeddings(
+    embedder: EmbeddingGenerator,
+    df_chunks: pd.DataFrame,
+    parquet_path: str,
+    npy_path: str,
+    csv_path: Optional[str] = None,
+    batch_size: int = 256
+):
+    """
+    Embed chunks batch by batch and append each batch to the output files
+
+    Only one batch of embeddings is held in memory at a time: rows go to a
+    Parquet writer (and the legacy CSV, if requested) and into a
+    memory-mapped .npy matrix as soon as they are encoded.
+
+    Args:
+        embedder: Embedding generator
+        df_chunks: Chunked DataFrame (without embeddings)
+        parquet_path: Output Parquet file with chunks and embeddings
+        npy_path: Output .npy embedding matrix
+        csv_path: Optional legacy CSV output with JSON-serialized embeddings
+        batch_size: Chunks encoded and written per batch
+    """
+    dim = embedder.embedding_dim
+    chunk_schema = pa.Schema.from_pandas(df_chunks, preserve_index=False)
+    schema = chunk_schema.append(pa.field('embedding', pa.list_(pa.float32())))
+
+    matrix = np.lib.format.open_memmap(
+        npy_path, mode='w+', dtype=np.float32, shape=(len(df_chunks), dim)
+    )
+    texts = df_chunks['chunk_text'].fillna('').tolist()
+
+    with pq.ParquetWriter(parquet_path, schema, compression='zstd') as writer:
+        for start in range(0, len(df_chunks), batch_size):
+            batch = df_chunks.iloc[start:start + batch_size]
+            embeddings = embedder.generate_embeddings_batch(
+                texts[start:start + batch_size],
+                show_progress=False
+            )
+            matrix[start:start + len(batch)] = embeddings
+
+            # list<float32> column built zero-copy over the batch matrix
+            offsets = np.arange(0, (len(batch) + 1) * dim, dim, dtype=np.int32)
+            embedding_array = pa.ListArray.from_arrays(offsets, embeddings.ravel())
+            table = pa.Table.from_pandas(batch, schema=chunk_schema, preserve_index=False)
+            writer.write_table(table.append_column(schema.field('embedding'), embedding_array))
+
+            if csv_path:
+                batch.assign(
+                    embedding=[json.dumps(vector.tolist()) for vector in embeddings]
+                ).to_csv(csv_path, mode='w' if start == 0 else 'a',
+                         header=start == 0, index=False)
+
+    matrix.flush()
+
+
 def process_credit_memos_for_rag(
     input_csv: str,
     output_dir: str = 'rag_data',
     text_column: str = 'risk_analysis',
     id_column: str = 'memo_id',
     max_chunk_length: int = 300,
-    embedding_model: str = 'all-mpnet-base-v2'
+    embedding_model: str = 'all-mpnet-base-v2',
+    legacy_csv: bool = False,
+    quantize_int8: bool = False
 ) -> Dict[str, Any]:
     """
     Complete pipeline: chunk credit memos and generate embeddings
@@ -219,9 +447,12 @@ def process_credit_memos_for_rag(
         id_column: Column with unique IDs
         max_chunk_length: Maximum chunk length
         embedding_model: Sentence transformer model name
+        legacy_csv: Also write the chunk and embedding files as CSV
+        quantize_int8: Also write an int8-quantized embedding matrix (4x smaller)
 
     Returns:
-        Dictionary with processing results
+        Dictionary with processing results, including the chunked
+        DataFrame under 'df_chunks'
     """
     print("\n" + "="*60)
     print("Processing Credit Memos for RAG Knowledge Base")
@@ -250,24 +481,60 @@ def process_credit_memos_for_rag(
     print(f"   ✓ Created {len(df_chunks)} chunks from {len(df)} memos")
 
     # Save chunked data
-    chunks_csv = os.path.join(output_dir, "credit_memo_risk_chunks.csv")
-    df_chunks.to_csv(chunks_csv, index=False)
-    print(f"   ✓ Saved chunks to: {chunks_csv}")
+    chunks_parquet = os.path.join(output_dir, "credit_memo_risk_chunks.parquet")
+    df_chunks.to_parquet(chunks_parquet, engine='pyarrow', compression='zstd', index=False)
+    print(f"   ✓ Saved chunks to: {chunks_parquet}")
 
-    # Step 3: Generate embeddings
+    chunks_csv = None
+    if legacy_csv:
+        chunks_csv = os.path.join(output_dir, "credit_memo_risk_chunks.csv")
+        df_chunks.to_csv(chunks_csv, index=False)
+        print(f"   ✓ Saved chunks to: {chunks_csv}")
+
+    # Step 3: Generate embeddings, streaming each batch straight to disk
     print(f"\n3. Generating embeddings (model: {embedding_model})")
     embedder = EmbeddingGenerator(model_name=embedding_model)
 
-    df_chunks = embedder.add_embeddings_to_dataframe(
+    # Parquet stores vectors natively as list<float32>, no text round trip;
+    # the .npy matrix can be memory-mapped by loaders
+    embeddings_parquet = os.path.join(output_dir, "credit_memo_chunks_with_embeddings.parquet")
+    embeddings_npy = os.path.join(output_dir, "credit_memo_chunk_embeddings.npy")
+    embeddings_csv = None
+    if legacy_csv:
+        # Vectors serialized as JSON lists for the CSV loader
+        embeddings_csv = os.path.join(output_dir, "credit_memo_chunks_with_embeddings.csv")
+
+    print(f"Generating embeddings for {len(df_chunks)} texts...")
+    _stream_embeddings(
+        embedder,
         df_chunks,
-        text_column='chunk_text',
-        embedding_column='embedding'
+        parquet_path=embeddings_parquet,
+        npy_path=embeddings_npy,
+        csv_path=embeddings_csv
     )
-
-    # Save with embeddings
-    embeddings_csv = os.path.join(output_dir, "credit_memo_chunks_with_embeddings.csv")
-    df_chunks.to_csv(embeddings_csv, index=False)
-    print(f"   ✓ Saved embeddings to: {embeddings_csv}")
+    print(f"   ✓ Saved embeddings to: {embeddings_parquet}")
+    if embeddings_csv:
+        print(f"   ✓ Saved embeddings to: {embeddings_csv}")
+    print(f"   ✓ Saved embedding matrix to: {embeddings_npy}")
+
+    embeddings_int8_npy = None
+    int8_ranges_npy = None
+    if quantize_int8:
+        # Calibrate on the full memory-mapped matrix, then quantize in slices
+        embedding_matrix = np.load(embeddings_npy, mmap_mode='r')
+        ranges = np.vstack((embedding_matrix.min(axis=0), embedding_matrix.max(axis=0)))
+        embeddings_int8_npy = os.path.join(output_dir, "credit_memo_chunk_embeddings_int8.npy")
+        int8_ranges_npy = os.path.join(output_dir, "credit_memo_chunk_embeddings_int8_ranges.npy")
+        quantized = np.lib.format.open_memmap(
+            embeddings_int8_npy, mode='w+', dtype=np.int8, shape=embedding_matrix.shape
+        )
+        for start in range(0, len(embedding_matrix), 4096):
+            quantized[start:start + 4096] = quantize_embeddings_int8(
+                embedding_matrix[start:start + 4096], ranges
+            )[0]
+        quantized.flush()
+        np.save(int8_ranges_npy, ranges)
+        print(f"   ✓ Saved int8 embedding matrix to: {embeddings_int8_npy}")
 
     # Step 4: Generate statistics
     print("\n" + "="*60)
@@ -284,8 +551,7 @@ def process_credit_memos_for_rag(
 
     # Risk score distribution
     print(f"\nChunks by risk score:")
-    for score in sorted(df_chunks['score'].unique()):
-        count = len(df_chunks[df_chunks['score'] == score])
+    for score, count in df_chunks.groupby('score').size().sort_index().items():
         print(f"  Score {score}: {count} chunks")
 
     print("\n" + "="*60)
@@ -295,10 +561,16 @@ def process_credit_memos_for_rag(
     return {
         'original_memos': len(df),
         'total_chunks': len(df_chunks),
+        'chunks_parquet': chunks_parquet,
+        'embeddings_parquet': embeddings_parquet,
         'chunks_csv': chunks_csv,
         'embeddings_csv': embeddings_csv,
+        'embeddings_npy': embeddings_npy,
+        'embeddings_int8_npy': embeddings_int8_npy,
+        'int8_ranges_npy': int8_ranges_npy,
         'embedding_dimension': embedder.embedding_dim,
-        'model_name': embedder.model_name
+        'model_name': embedder.model_name,
+        'df_chunks': df_chunks
     }
 
 
@@ -330,7 +602,10 @@ if __name__ == "__main__":
     # Display sample
     print("\nSample Chunks:")
     print("="*60)
-    df_chunks = pd.read_csv(results['chunks_csv'])
+    if 'df_chunks' in results:
+        df_chunks = results['df_chunks']
+    else:
+        df_chunks = pd.read_parquet(results['chunks_parquet'])
     for i in range(min(3, len(df_chunks))):
         row = df_chunks.iloc[i]
         print(f"\nChunk {i+1}: {row['chunk_id']}")
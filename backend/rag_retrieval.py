@@ -4,8 +4,13 @@ Integrates semantic search with knowledge base for context-aware credit memo gen
 """
 
 import os
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
 from typing import List, Dict, Any, Optional
-from sentence_transformers import SentenceTransformer
+import numpy as np
+from rag_chunking import (
+    load_embedding_model, resolve_device, resolve_backend, inference_context
+)
 from rag_vector_db import VectorDatabase
 from dotenv import load_dotenv
 
@@ -16,6 +21,23 @@ class RAGRetriever:
     Combines query embedding with semantic search to retrieve relevant context
     """
 
+    # Financial profile buckets for similar-memo queries:
+    # (ratio key, ascending thresholds, label per bucket, bisect function).
+    # bisect_right puts a value equal to a threshold in the upper bucket
+    # (">=" cutoffs); bisect_left keeps it in the lower one ("<=" cutoffs)
+    _PROFILE_BUCKETS = (
+        ('dscr', (1.25, 1.5),
+         ('weak debt service coverage', 'adequate debt service coverage',
+          'strong debt service coverage'),
+         bisect_right),
+        ('current_ratio', (1.5, 2.0),
+         ('liquidity concerns', 'adequate liquidity', 'strong liquidity'),
+         bisect_right),
+        ('leverage_ratio', (0.3, 0.5),
+         ('low leverage', 'moderate leverage', 'high leverage'),
+         bisect_left),
+    )
+
     def __init__(
         self,
         embedding_model: str = 'all-mpnet-base-v2',
@@ -23,7 +45,10 @@ class RAGRetriever:
         db_port: Optional[int] = None,
         db_name: Optional[str] = None,
         db_user: Optional[str] = None,
-        db_password: Optional[str] = None
+        db_password: Optional[str] = None,
+        device: Optional[str] = None,
+        query_cache_size: int = 1024,
+        backend: Optional[str] = None
     ):
         """
         Initialize RAG retriever
@@ -31,17 +56,26 @@ class RAGRetriever:
         Args:
             embedding_model: Sentence transformer model name
             db_host, db_port, db_name, db_user, db_password: Database connection params
+            device: Torch device for the embedding model (default: cuda if available)
+            query_cache_size: Number of query embeddings kept in the LRU cache
+            backend: Inference backend, 'torch' or 'onnx' (default: EMBEDDING_BACKEND or 'torch')
         """
         load_dotenv()
 
         print("Initializing RAG retriever...")
 
         # Initialize embedding model
-        print(f"  Loading embedding model: {embedding_model}...")
-        self.model = SentenceTransformer(embedding_model)
+        self.device = resolve_device(device)
+        self.backend = resolve_backend(backend)
+        print(f"  Loading embedding model: {embedding_model} ({self.device}, {self.backend})...")
+        self.model = load_embedding_model(embedding_model, self.device, self.backend)
         self.embedding_dim = self.model.get_sentence_embedding_dimension()
         print(f"  ✓ Model loaded (dimension: {self.embedding_dim})")
 
+        # LRU cache of query text -> embedding; repeated profile queries skip the encoder
+        self.query_cache_size = query_cache_size
+        self._query_cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
+
         # Initialize database connection
         print(f"  Connecting to vector database...")
         self.db = VectorDatabase(
@@ -60,7 +94,62 @@ class RAGRetriever:
             print("⚠ RAG retriever initialized but database connection failed")
             print("  Semantic search will not be available")
 
-    def embed_query(self, query: str) -> List[float]:
+    def embed_queries(self, queries: List[str]) -> np.ndarray:
+        """
+        Generate embeddings for several queries in a single encode call
+
+        Args:
+            queries: Query texts
+
+        Returns:
+            Unit-norm float32 matrix of shape (len(queries), embedding_dim);
+            empty queries get a zero vector
+        """
+        embeddings = np.zeros((len(queries), self.embedding_dim), dtype=np.float32)
+
+        # Serve repeated queries from the cache
+        misses = []
+        for i, query in enumerate(queries):
+            if not query:
+                continue
+            cached = self._query_cache.get(query)
+            if cached is not None:
+                self._query_cache.move_to_end(query)
+                embeddings[i] = cached
+            else:
+                misses.append(i)
+
+        if misses:
+            # Encode each distinct uncached query once
+            new_queries = list(dict.fromkeys(queries[i] for i in misses))
+            with inference_context(self.device):
+                encoded = self.model.encode(
+                    new_queries,
+                    batch_size=min(32, len(new_queries)),
+                    convert_to_numpy=True,
+                    normalize_embeddings=True
+                )
+            encoded_by_query = dict(zip(new_queries, encoded))
+
+            for i in misses:
+                embeddings[i] = encoded_by_query[queries[i]]
+
+            for query, embedding in encoded_by_query.items():
+                self._cache_query_embedding(query, embedding)
+
+        return embeddings
+
+    def _cache_query_embedding(self, query: str, embedding: np.ndarray):
+        """Store a query embedding, evicting the least recently used entry"""
+        if self.query_cache_size <= 0:
+            return
+
+        self._query_cache[query] = embedding
+        self._query_cache.move_to_end(query)
+        while len(self._query_cache) > self.query_cache_size:
+            self._query_cache.popitem(last=False)
+
+    def embed_query(self, query: str) -> np.ndarray:
         """
         Generate embedding for a query
 
@@ -68,13 +157,9 @@ class RAGRetriever:
             query: Query text
 
         Returns:
-            Embedding vector
+            Unit-norm float32 embedding vector
         """
-        if not query:
-            return [0.0] * self.embedding_dim
-
-        embedding = self.model.encode(query, convert_to_numpy=True)
-        return embedding.tolist()
+        return self.embed_queries([query])[0]
 
     def retrieve_context(
         self,
@@ -104,22 +189,50 @@ class RAGRetriever:
         # Generate query embedding
         query_embedding = self.embed_query(query)
 
-        # Perform semantic search
-        results = self.db.semantic_search(
+        # Perform semantic search; threshold and limit are applied in SQL
+        return self.db.semantic_search(
             query_embedding=query_embedding,
-            limit=limit * 2,  # Get more results to filter by threshold
+            limit=limit,
             score_filter=score_filter,
-            borrower_filter=borrower_filter
+            borrower_filter=borrower_filter,
+            similarity_threshold=similarity_threshold
         )
 
-        # Filter by similarity threshold
-        filtered_results = [
-            r for r in results
-            if r.get('similarity', 0) >= similarity_threshold
-        ]
+    def retrieve_contexts(
+        self,
+        queries: List[str],
+        limit: int = 5,
+        score_filter: Optional[int] = None,
+        borrower_filter: Optional[str] = None,
+        similarity_threshold: float = 0.5
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Retrieve relevant context chunks for several queries at once
 
-        # Limit results
-        return filtered_results[:limit]
+        Args:
+            queries: Query texts
+            limit: Maximum number of results per query
+            score_filter: Filter by risk score (1-5)
+            borrower_filter: Filter by borrower type
+            similarity_threshold: Minimum similarity score (0-1)
+
+        Returns:
+            One list of relevant chunks per query, in query order
+        """
+        if not self.connected:
+            print("⚠ Database not connected, cannot retrieve context")
+            return [[] for _ in queries]
+
+        # Embed all queries in one forward pass, search in one round-trip
+        query_embeddings = self.embed_queries(queries)
+
+        return self.db.batch_semantic_search(
+            query_embeddings,
+            limit=limit,
+            score_filter=score_filter,
+            borrower_filter=borrower_filter,
+            similarity_threshold=similarity_threshold
+        )
 
     def format_context_for_llm(
         self,
@@ -188,32 +301,10 @@ class RAGRetriever:
         query_parts.append(f"{borrower_industry}")
 
         # Add financial strength indicators
-        dscr = ratios.get('dscr')
-        if dscr:
-            if dscr >= 1.5:
-                query_parts.append("strong debt service coverage")
-            elif dscr >= 1.25:
-                query_parts.append("adequate debt service coverage")
-            else:
-                query_parts.append("weak debt service coverage")
-
-        current_ratio = ratios.get('current_ratio')
-        if current_ratio:
-            if current_ratio >= 2.0:
-                query_parts.append("strong liquidity")
-            elif current_ratio >= 1.5:
-                query_parts.append("adequate liquidity")
-            else:
-                query_parts.append("liquidity concerns")
-
-        leverage = ratios.get('leverage_ratio')
-        if leverage:
-            if leverage <= 0.3:
-                query_parts.append("low leverage")
-            elif leverage <= 0.5:
-                query_parts.append("moderate leverage")
-            else:
-                query_parts.append("high leverage")
+        for ratio_key, thresholds, labels, bucket in self._PROFILE_BUCKETS:
+            value = ratios.get(ratio_key)
+            if value:
+                query_parts.append(labels[bucket(thresholds, value)])
 
         # Create query
         query = " ".join(query_parts)
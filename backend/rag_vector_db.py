@@ -4,24 +4,115 @@ Handles PostgreSQL with pgvector for semantic search
 """
 
 import os
+import io
+import threading
+import multiprocessing
+import weakref
+from itertools import chain, islice
+from collections import OrderedDict
+from contextlib import contextmanager
 import psycopg2
-from psycopg2.extras import execute_values
+from psycopg2.extras import execute_values, RealDictCursor
+from psycopg2.pool import ThreadedConnectionPool
+from pgvector.psycopg2 import register_vector
 import pandas as pd
-from typing import List, Dict, Any, Optional, Tuple
+import pyarrow.parquet as pq
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Tuple, Union
 import json
+import numpy as np
 from dotenv import load_dotenv
 
+# orjson parses embedding lists in C; fall back to the stdlib parser
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
+
+
+# Read .env once at import; VectorDatabase instances reuse these defaults
+load_dotenv()
+_DEFAULTS = {
+    'host': os.getenv('POSTGRES_HOST', 'localhost'),
+    'port': int(os.getenv('POSTGRES_PORT', 5432)),
+    'database': os.getenv('POSTGRES_DB', 'credit_memo_kb'),
+    'user': os.getenv('POSTGRES_USER', 'postgres'),
+    'password': os.getenv('POSTGRES_PASSWORD', ''),
+    'max_connections': int(os.getenv('POSTGRES_POOL_MAX', 16)),
+    'embedding_type': os.getenv('PGVECTOR_EMBEDDING_TYPE', 'vector'),
+}
+
+# Rows per DataFrame chunk streamed from the KB file (one COPY per chunk)
+LOAD_CHUNK_ROWS = 10000
+
+# Narrow integer columns when reading the chunk CSV (nullable, so gaps survive)
+CSV_DTYPES = {'chunk_index': 'Int32', 'chunk_length': 'Int32', 'score': 'Int8'}
+
+# Default number of query texts memoized per embedder by search_text
+QUERY_EMBED_CACHE_SIZE = int(os.getenv('QUERY_EMBED_CACHE_SIZE', 1024))
+
+
+def _encode_query(embedder, text: str) -> np.ndarray:
+    """
+    Encode one query through the shared inference path
+
+    Args:
+        embedder: RAGRetriever (anything with embed_queries) or an object with
+            encode(), e.g. a SentenceTransformer
+
+    Returns:
+        Unit-norm float32 embedding
+    """
+    if hasattr(embedder, 'embed_queries'):
+        return np.asarray(embedder.embed_queries([text])[0], dtype=np.float32)
+
+    # Imported here so loaders and workers don't pay for torch at import time
+    from rag_chunking import inference_context
+
+    with inference_context(str(getattr(embedder, 'device', 'cpu'))):
+        embedding = np.asarray(embedder.encode(text), dtype=np.float32)
+    norm = np.linalg.norm(embedding)
+    return embedding / norm if norm > 0 else embedding
+
+
+class _PooledConnection(psycopg2.extensions.connection):
+    """psycopg2 connection that remembers its server-side prepared statements"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.prepared = {}
+
 
 class VectorDatabase:
     """Manages PostgreSQL with pgvector for semantic search"""
 
+    # Max insert_chunks / insert_chunks_copy batch while the HNSW index is maintained per row
+    HNSW_LOAD_BATCH_SIZE = 2000
+
+    # Scores covered by the partial high-risk HNSW index (decline / conditional)
+    HIGH_RISK_MAX_SCORE = 2
+
+    # HNSW indexes on the embedding column (idx_embedding_hnsw is the legacy
+    # cosine index from earlier setups)
+    VECTOR_INDEXES = ('idx_embedding_hnsw', 'idx_embedding_hnsw_ip', 'idx_embedding_hnsw_high_risk')
+
+    # Columns semantic_search can return, in default result order
+    SEARCH_FIELDS = (
+        'chunk_id', 'original_id', 'title', 'borrower', 'loan_type',
+        'chunk_text', 'score', 'recommendation', 'similarity'
+    )
+
     def __init__(
         self,
         host: Optional[str] = None,
         port: Optional[int] = None,
         database: Optional[str] = None,
         user: Optional[str] = None,
-        password: Optional[str] = None
+        password: Optional[str] = None,
+        max_connections: Optional[int] = None,
+        embedding_type: Optional[str] = None,
+        sim_cache_size: int = 0,
+        sim_cache_threshold: float = 0.97,
+        embed_cache_size: Optional[int] = None
     ):
         """
         Initialize vector database connection
@@ -32,37 +123,73 @@ class VectorDatabase:
             database: Database name (or use POSTGRES_DB env var)
             user: Database user (or use POSTGRES_USER env var)
             password: Database password (or use POSTGRES_PASSWORD env var)
+            max_connections: Connection pool size (or use POSTGRES_POOL_MAX env var, default: 16)
+            embedding_type: 'vector' (float32) or 'halfvec' (float16, pgvector >= 0.7)
+                storage for embeddings (or use PGVECTOR_EMBEDDING_TYPE env var)
+            sim_cache_size: Max cached semantic_search results (default 0,
+                disabled). Opt-in: a near-duplicate query gets the cached
+                query's rows and similarity values, not ones computed for it,
+                and only this instance's own writes invalidate the cache, so
+                loads from other processes are not seen until it is cleared
+            sim_cache_threshold: Cosine similarity above which a cached
+                query's results are reused for a new query
+            embed_cache_size: Query texts memoized per embedder by search_text
+                (or use QUERY_EMBED_CACHE_SIZE env var, default: 1024; 0 disables)
         """
-        load_dotenv()
-
-        self.host = host or os.getenv('POSTGRES_HOST', 'localhost')
-        self.port = port or int(os.getenv('POSTGRES_PORT', 5432))
-        self.database = database or os.getenv('POSTGRES_DB', 'credit_memo_kb')
-        self.user = user or os.getenv('POSTGRES_USER', 'postgres')
-        self.password = password or os.getenv('POSTGRES_PASSWORD', '')
-
-        self.conn = None
+        self.host = host or _DEFAULTS['host']
+        self.port = port or _DEFAULTS['port']
+        self.database = database or _DEFAULTS['database']
+        self.user = user or _DEFAULTS['user']
+        self.password = password or _DEFAULTS['password']
+        self.max_connections = max_connections or _DEFAULTS['max_connections']
+        self.embedding_type = embedding_type or _DEFAULTS['embedding_type']
+        if self.embedding_type not in ('vector', 'halfvec'):
+            raise ValueError(f"Unsupported embedding_type: {self.embedding_type}")
+
+        self.pool = None
         self.embedding_dimension = None
+        self.vector_registered = False
+
+        # Semantic result cache: a preallocated (size, dim) matrix of unit query
+        # embeddings scored with one matmul per lookup. _sim_cache maps
+        # key -> slot in LRU order; per-slot filter ids, keys and results sit
+        # alongside the matrix rows (allocated on first store)
+        self.sim_cache_size = sim_cache_size
+        self.sim_cache_threshold = sim_cache_threshold
+        self._sim_cache = OrderedDict()
+        self._sim_cache_lock = threading.Lock()
+        self._reset_sim_cache()
+
+        # search_text embeddings: embedder -> LRU of text -> embedding. Weakly
+        # keyed so a cached embedder can still be garbage collected
+        self.embed_cache_size = QUERY_EMBED_CACHE_SIZE if embed_cache_size is None else embed_cache_size
+        self._embed_cache = weakref.WeakKeyDictionary()
+        self._embed_cache_lock = threading.Lock()
 
     def connect(self) -> bool:
         """
-        Establish connection to PostgreSQL
+        Open the PostgreSQL connection pool
 
         Returns:
             True if connection successful
         """
         try:
-            self.conn = psycopg2.connect(
+            self.pool = ThreadedConnectionPool(
+                minconn=1,
+                maxconn=self.max_connections,
                 host=self.host,
                 port=self.port,
                 database=self.database,
                 user=self.user,
-                password=self.password
+                password=self.password,
+                connection_factory=_PooledConnection
             )
-            self.conn.autocommit = False
+            with self._acquire() as conn:
+                self._register_vector_type(conn)
             print(f"✓ Connected to PostgreSQL at {self.host}:{self.port}/{self.database}")
             return True
         except psycopg2.Error as e:
+            self.pool = None
             print(f"✗ Database connection failed: {e}")
             print(f"\nConnection parameters:")
             print(f"  Host: {self.host}")
@@ -72,15 +199,53 @@ class VectorDatabase:
             print(f"\nMake sure PostgreSQL is running and credentials are correct.")
             return False
 
+    @contextmanager
+    def _acquire(self):
+        """
+        Check a connection out of the pool for the duration of a block
+
+        Yields:
+            psycopg2 connection (returned to the pool afterwards; any open
+            transaction is rolled back by the pool)
+        """
+        conn = self.pool.getconn()
+        try:
+            yield conn
+        finally:
+            self.pool.putconn(conn)
+
+    def _register_vector_type(self, conn) -> bool:
+        """
+        Register pgvector adapters so numpy arrays bind directly as vectors
+
+        Args:
+            conn: Connection used to look up the vector type
+
+        Returns:
+            True if the vector type exists and adapters were registered
+        """
+        try:
+            register_vector(conn)
+            self.vector_registered = True
+        except psycopg2.ProgrammingError:
+            # Extension not created yet; create_table registers it afterwards
+            conn.rollback()
+            self.vector_registered = False
+        return self.vector_registered
+
     def disconnect(self):
-        """Close database connection"""
-        if self.conn:
-            self.conn.close()
+        """Close all pooled database connections"""
+        if self.pool:
+            self.pool.closeall()
+            self.pool = None
             print("✓ Disconnected from database")
 
-    def setup_database(self, embedding_dim: int = 768) -> bool:
+    def create_table(self, embedding_dim: int = 768) -> bool:
         """
-        Set up database schema with pgvector extension
+        Create the pgvector extension, memo_kb_chunks table and b-tree indexes
+
+        The HNSW index is left to create_vector_index so bulk loads can insert
+        into an unindexed table and build the graph once afterwards.
 
         Args:
             embedding_dim: Dimension of embedding vectors (default: 768 for all-mpnet-base-v2)
@@ -88,87 +253,295 @@ class VectorDatabase:
         Returns:
             True if setup successful
         """
-        if not self.conn:
+        if not self.pool:
             print("✗ Not connected to database")
             return False
 
         self.embedding_dimension = embedding_dim
 
-        try:
-            cur = self.conn.cursor()
-
-            print(f"\nSetting up vector database (dimension: {embedding_dim})...")
-
-            # Step 1: Enable pgvector extension
-            print("  1. Enabling pgvector extension...")
-            cur.execute("CREATE EXTENSION IF NOT EXISTS vector;")
-            print("     ✓ pgvector extension enabled")
-
-            # Step 2: Create table
-            print("  2. Creating memo_kb_chunks table...")
-            create_table_sql = f"""
-            CREATE TABLE IF NOT EXISTS memo_kb_chunks (
-                id SERIAL PRIMARY KEY,
-                chunk_id VARCHAR(32) UNIQUE NOT NULL,
-                original_id VARCHAR(16) NOT NULL,
-                chunk_index INT NOT NULL,
-                title TEXT,
-                borrower VARCHAR(255),
-                loan_type VARCHAR(255),
-                chunk_text TEXT NOT NULL,
-                chunk_length INT,
-                score INT,
-                recommendation TEXT,
-                embedding VECTOR({embedding_dim}),
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            );
-            """
-            cur.execute(create_table_sql)
-            print("     ✓ Table created")
-
-            # Step 3: Create indexes
-            print("  3. Creating indexes...")
-
-            # Index on chunk_id for fast lookups
-            cur.execute("""
-                CREATE INDEX IF NOT EXISTS idx_chunk_id
-                ON memo_kb_chunks(chunk_id);
-            """)
-
-            # Index on original_id for finding all chunks of a memo
-            cur.execute("""
-                CREATE INDEX IF NOT EXISTS idx_original_id
-                ON memo_kb_chunks(original_id);
-            """)
-
-            # Index on score for filtering by risk level
-            cur.execute("""
-                CREATE INDEX IF NOT EXISTS idx_score
-                ON memo_kb_chunks(score);
-            """)
-
-            # Vector index using HNSW for fast similarity search
-            cur.execute(f"""
-                CREATE INDEX IF NOT EXISTS idx_embedding_hnsw
-                ON memo_kb_chunks
-                USING hnsw (embedding vector_cosine_ops);
-            """)
-
-            print("     ✓ Indexes created")
-
-            # Commit changes
-            self.conn.commit()
-            cur.close()
+        with self._acquire() as conn:
+            try:
+                cur = conn.cursor()
+
+                print(f"\nSetting up vector database (dimension: {embedding_dim})...")
+
+                # Step 1: Enable pgvector extension
+                print("  1. Enabling pgvector extension...")
+                cur.execute("CREATE EXTENSION IF NOT EXISTS vector;")
+                if not self.vector_registered:
+                    self._register_vector_type(conn)
+                print("     ✓ pgvector extension enabled")
+
+                # Step 2: Create table
+                print("  2. Creating memo_kb_chunks table...")
+                create_table_sql = f"""
+                CREATE TABLE IF NOT EXISTS memo_kb_chunks (
+                    id SERIAL PRIMARY KEY,
+                    chunk_id VARCHAR(32) UNIQUE NOT NULL,
+                    original_id VARCHAR(16) NOT NULL,
+                    chunk_index INT NOT NULL,
+                    title TEXT,
+                    borrower VARCHAR(255),
+                    loan_type VARCHAR(255),
+                    chunk_text TEXT NOT NULL,
+                    chunk_length INT,
+                    score INT,
+                    recommendation TEXT,
+                    embedding {self.embedding_type.upper()}({embedding_dim}),
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                );
+                """
+                cur.execute(create_table_sql)
+                print("     ✓ Table created")
+
+                # Step 3: Create indexes
+                print("  3. Creating indexes...")
+
+                # Index on chunk_id for fast lookups
+                cur.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_chunk_id
+                    ON memo_kb_chunks(chunk_id);
+                """)
+
+                # Index on original_id for finding all chunks of a memo
+                cur.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_original_id
+                    ON memo_kb_chunks(original_id);
+                """)
+
+                # Index on score for filtering by risk level
+                cur.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_score
+                    ON memo_kb_chunks(score);
+                """)
+
+                # Trigram index for semantic_search's borrower ILIKE '%...%'
+                # filter; optional, so a missing pg_trgm doesn't fail setup
+                cur.execute("SAVEPOINT trgm;")
+                try:
+                    cur.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm;")
+                    cur.execute("""
+                        CREATE INDEX IF NOT EXISTS idx_borrower_trgm
+                        ON memo_kb_chunks USING gin (borrower gin_trgm_ops);
+                    """)
+                    cur.execute("RELEASE SAVEPOINT trgm;")
+                except psycopg2.Error as e:
+                    cur.execute("ROLLBACK TO SAVEPOINT trgm;")
+                    print(f"     ⚠ Skipping borrower trigram index: {e}")
+
+                print("     ✓ Indexes created")
+
+                # Commit changes
+                conn.commit()
+                cur.close()
+
+                print("\n✓ Table setup complete!")
+                return True
+
+            except psycopg2.Error as e:
+                print(f"\n✗ Database setup failed: {e}")
+                conn.rollback()
+                return False
+
+    def _drop_vector_indexes(self, cur):
+        """Drop every HNSW index on memo_kb_chunks within the current transaction"""
+        for name in self.VECTOR_INDEXES:
+            cur.execute(f"DROP INDEX IF EXISTS {name};")
+
+    def drop_vector_indexes(self) -> bool:
+        """
+        Drop the HNSW indexes before a bulk (re)load
 
-            print("\n✓ Database setup complete!")
-            return True
+        Without this, every loaded row also updates each HNSW graph; the load
+        pipeline drops them first and rebuilds with create_vector_index.
 
-        except psycopg2.Error as e:
-            print(f"\n✗ Database setup failed: {e}")
-            self.conn.rollback()
+        Returns:
+            True if the indexes were dropped (or did not exist)
+        """
+        if not self.pool:
+            print("✗ Not connected to database")
             return False
 
-    def insert_chunks(self, df: pd.DataFrame, batch_size: int = 100) -> int:
+        with self._acquire() as conn:
+            try:
+                cur = conn.cursor()
+                self._drop_vector_indexes(cur)
+                conn.commit()
+                cur.close()
+                print("✓ Vector indexes dropped for bulk load")
+                return True
+
+            except psycopg2.Error as e:
+                print(f"✗ Dropping vector indexes failed: {e}")
+                conn.rollback()
+                return False
+
+    def create_vector_index(
+        self,
+        hnsw_m: int = 24,
+        hnsw_ef_construction: int = 200
+    ) -> bool:
+        """
+        Build the HNSW index on the embedding column
+
+        Call after bulk loading so the graph is built once instead of being
+        updated on every insert. Existing HNSW indexes are dropped and rebuilt,
+        so new hnsw_m / hnsw_ef_construction values always take effect.
+
+        Args:
+            hnsw_m: Max connections per HNSW graph node (pgvector default: 16)
+            hnsw_ef_construction: Candidate list size while building the HNSW
+                graph (pgvector default: 64)
+
+        Returns:
+            True if the index was created
+        """
+        if not self.pool:
+            print("✗ Not connected to database")
+            return False
+
+        with self._acquire() as conn:
+            try:
+                cur = conn.cursor()
+
+                print("\nBuilding HNSW vector index...")
+
+                # Vector index using HNSW for fast similarity search. Embeddings
+                # are unit-norm, so inner product ranks the same as cosine.
+                # Rebuild from scratch (including the legacy cosine index)
+                self._drop_vector_indexes(cur)
+                # Larger build memory keeps the HNSW graph build in RAM
+                cur.execute("SET LOCAL maintenance_work_mem = '2GB';")
+                cur.execute(f"""
+                    CREATE INDEX idx_embedding_hnsw_ip
+                    ON memo_kb_chunks
+                    USING hnsw (embedding {self.embedding_type}_ip_ops)
+                    WITH (m = {int(hnsw_m)}, ef_construction = {int(hnsw_ef_construction)});
+                """)
+
+                # Partial HNSW index over high-risk memos (decline / conditional).
+                # A score filter applied after the full-table ANN scan often
+                # leaves fewer than `limit` rows; this index lets high-risk
+                # searches scan only matches. semantic_search inlines those
+                # score values as literals, since a generic plan for a
+                # parameterised `score = $n` can't prove the index predicate
+                cur.execute(f"""
+                    CREATE INDEX idx_embedding_hnsw_high_risk
+                    ON memo_kb_chunks
+                    USING hnsw (embedding {self.embedding_type}_ip_ops)
+                    WITH (m = {int(hnsw_m)}, ef_construction = {int(hnsw_ef_construction)})
+                    WHERE score <= {int(self.HIGH_RISK_MAX_SCORE)};
+                """)
+
+                conn.commit()
+                cur.close()
+
+                print("✓ Vector index created")
+                return True
+
+            except psycopg2.Error as e:
+                print(f"✗ Vector index creation failed: {e}")
+                conn.rollback()
+                return False
+
+    def setup_database(
+        self,
+        embedding_dim: int = 768,
+        hnsw_m: int = 24,
+        hnsw_ef_construction: int = 200
+    ) -> bool:
+        """
+        Set up database schema with pgvector extension, including the HNSW index
+
+        Args:
+            embedding_dim: Dimension of embedding vectors (default: 768 for all-mpnet-base-v2)
+            hnsw_m: Max connections per HNSW graph node (pgvector default: 16)
+            hnsw_ef_construction: Candidate list size while building the HNSW
+                graph (pgvector default: 64)
+
+        Returns:
+            True if setup successful
+        """
+        return (
+            self.create_table(embedding_dim=embedding_dim)
+            and self.create_vector_index(
+                hnsw_m=hnsw_m,
+                hnsw_ef_construction=hnsw_ef_construction
+            )
+        )
+
+    @staticmethod
+    def _build_records(df: pd.DataFrame) -> List[tuple]:
+        """
+        Build insert tuples column-wise instead of iterating rows
+
+        Args:
+            df: Chunk DataFrame (missing columns fall back to None / 0)
+
+        Returns:
+            List of record tuples in memo_kb_chunks column order
+        """
+        n = len(df)
+
+        def column(name, default=None):
+            if name in df.columns:
+                return df[name].tolist()
+            return [default] * n
+
+        def int_column(name):
+            if name in df.columns:
+                return df[name].fillna(0).astype(int).tolist()
+            return [0] * n
+
+        # Decode embeddings once into a float32 matrix (CSV stores JSON
+        # strings, parquet yields arrays); rows bind via the pgvector adapter
+        matrix = np.asarray(
+            [_json_loads(e) if isinstance(e, str) else e for e in df['embedding'].tolist()],
+            dtype=np.float32
+        )
+        embeddings = list(matrix)
+
+        return list(zip(
+            column('chunk_id'),
+            column('original_id'),
+            int_column('chunk_index'),
+            column('title'),
+            column('borrower'),
+            column('loan_type'),
+            column('chunk_text'),
+            int_column('chunk_length'),
+            int_column('score'),
+            column('recommendation'),
+            embeddings
+        ))
+
+    @staticmethod
+    def _has_vector_index(cur) -> bool:
+        """Check whether an HNSW index currently exists on memo_kb_chunks"""
+        cur.execute("""
+            SELECT 1 FROM pg_indexes
+            WHERE tablename = 'memo_kb_chunks' AND indexdef ILIKE '%USING hnsw%'
+            LIMIT 1;
+        """)
+        return cur.fetchone() is not None
+
+    @staticmethod
+    def _apply_bulk_load_settings(cur):
+        """
+        Relax durability for the current load transaction only
+
+        synchronous_commit=off skips the WAL fsync wait at commit (a crash can
+        lose the last load, which is simply re-run); SET LOCAL reverts it when
+        the transaction ends.
+        """
+        cur.execute("SET LOCAL synchronous_commit TO OFF;")
+
+    def insert_chunks(
+        self,
+        df: pd.DataFrame,
+        batch_size: int = 10000,
+        single_transaction: bool = True
+    ) -> int:
         """
         Insert chunked credit memos with embeddings into database
 
@@ -176,160 +549,603 @@ class VectorDatabase:
             df: DataFrame with columns: chunk_id, original_id, chunk_index,
                 title, borrower, loan_type, chunk_text, chunk_length, score,
                 recommendation, embedding
-            batch_size: Batch size for insertions
+            batch_size: Batch size for insertions (capped at
+                HNSW_LOAD_BATCH_SIZE while the HNSW index exists)
+            single_transaction: Commit once after all batches (default) instead
+                of after every batch
 
         Returns:
             Number of rows inserted
         """
-        if not self.conn:
+        if not self.pool:
             print("✗ Not connected to database")
             return 0
 
-        try:
-            cur = self.conn.cursor()
-
-            print(f"\nInserting {len(df)} chunks into database...")
-
-            # Prepare data for insertion
-            records = []
-            for _, row in df.iterrows():
-                # Convert embedding list to PostgreSQL array format
-                embedding = row['embedding']
-                if isinstance(embedding, str):
-                    # Parse string representation of list
-                    embedding = json.loads(embedding)
-
-                record = (
-                    row.get('chunk_id'),
-                    row.get('original_id'),
-                    int(row.get('chunk_index', 0)),
-                    row.get('title'),
-                    row.get('borrower'),
-                    row.get('loan_type'),
-                    row.get('chunk_text'),
-                    int(row.get('chunk_length', 0)),
-                    int(row.get('score', 0)),
-                    row.get('recommendation'),
-                    embedding
-                )
-                records.append(record)
-
-            # Insert in batches
-            insert_sql = """
-                INSERT INTO memo_kb_chunks
-                (chunk_id, original_id, chunk_index, title, borrower, loan_type,
-                 chunk_text, chunk_length, score, recommendation, embedding)
-                VALUES %s
-                ON CONFLICT (chunk_id) DO UPDATE SET
-                    chunk_text = EXCLUDED.chunk_text,
-                    embedding = EXCLUDED.embedding;
-            """
-
-            total_inserted = 0
-            for i in range(0, len(records), batch_size):
-                batch = records[i:i + batch_size]
-                execute_values(cur, insert_sql, batch)
-                total_inserted += len(batch)
-
-                if (i + batch_size) % (batch_size * 5) == 0:
-                    print(f"  Inserted {total_inserted}/{len(records)}...")
-
-            self.conn.commit()
-            cur.close()
+        with self._acquire() as conn:
+            try:
+                cur = conn.cursor()
+
+                print(f"\nInserting {len(df)} chunks into database...")
+
+                # Batches must share one explicit transaction
+                conn.autocommit = False
+                if self._has_vector_index(cur):
+                    # Each batch also updates the HNSW graph; keep them small.
+                    # Bulk loads should use drop_vector_indexes -> insert -> create_vector_index
+                    batch_size = min(batch_size, self.HNSW_LOAD_BATCH_SIZE)
+
+                records = self._build_records(df)
+                if not self.vector_registered:
+                    # No pgvector adapter; send embeddings as array literals
+                    records = [r[:-1] + (r[-1].tolist(),) for r in records]
+
+                # Insert in batches
+                insert_sql = """
+                    INSERT INTO memo_kb_chunks
+                    (chunk_id, original_id, chunk_index, title, borrower, loan_type,
+                     chunk_text, chunk_length, score, recommendation, embedding)
+                    VALUES %s
+                    ON CONFLICT (chunk_id) DO UPDATE SET
+                        chunk_text = EXCLUDED.chunk_text,
+                        embedding = EXCLUDED.embedding;
+                """
+
+                self._apply_bulk_load_settings(cur)
+
+                total_inserted = 0
+                for i in range(0, len(records), batch_size):
+                    batch = records[i:i + batch_size]
+                    execute_values(cur, insert_sql, batch)
+                    total_inserted += len(batch)
+
+                    if not single_transaction:
+                        conn.commit()
+                        self._apply_bulk_load_settings(cur)
+
+                    if (i + batch_size) % (batch_size * 5) == 0:
+                        print(f"  Inserted {total_inserted}/{len(records)}...")
+
+                conn.commit()
+                cur.close()
+                self.clear_search_cache()
+
+                print(f"✓ Inserted {total_inserted} chunks")
+                return total_inserted
+
+            except psycopg2.Error as e:
+                print(f"✗ Insert failed: {e}")
+                conn.rollback()
+                return 0
+
+    @staticmethod
+    def _copy_field(value) -> str:
+        """Format a value for COPY text format (tab-separated, \\N for NULL)"""
+        if value is None or (isinstance(value, float) and np.isnan(value)):
+            return '\\N'
+        if isinstance(value, np.ndarray):
+            # pgvector accepts the '[x1,x2,...]' literal
+            return '[' + ','.join(map(str, value.tolist())) + ']'
+        return (
+            str(value)
+            .replace('\\', '\\\\')
+            .replace('\t', '\\t')
+            .replace('\n', '\\n')
+            .replace('\r', '\\r')
+        )
+
+    def insert_chunks_copy(self, frames: Union[pd.DataFrame, Iterable[pd.DataFrame]]) -> int:
+        """
+        Bulk load chunks with COPY FROM STDIN, then upsert into memo_kb_chunks
 
-            print(f"✓ Inserted {total_inserted} chunks")
-            return total_inserted
+        Each DataFrame is streamed into a temp staging table in one round-trip
+        and merged with INSERT ... ON CONFLICT, so re-loading the KB still
+        updates existing chunks. All frames load in one transaction that is
+        committed once at the end; a failure rolls the whole load back. Use
+        insert_chunks for small incremental upserts.
 
-        except psycopg2.Error as e:
-            print(f"✗ Insert failed: {e}")
-            self.conn.rollback()
+        Args:
+            frames: DataFrame with the same columns as insert_chunks, or an
+                iterable of them (e.g. a file streamed in chunks)
+
+        Returns:
+            Number of rows loaded (0 if the load failed)
+        """
+        if not self.pool:
+            print("✗ Not connected to database")
             return 0
 
+        if isinstance(frames, pd.DataFrame):
+            frames = [frames]
+
+        columns = (
+            "chunk_id, original_id, chunk_index, title, borrower, loan_type, "
+            "chunk_text, chunk_length, score, recommendation, embedding"
+        )
+
+        with self._acquire() as conn:
+            try:
+                cur = conn.cursor()
+
+                # Staging table and merges must share one explicit transaction
+                conn.autocommit = False
+
+                self._apply_bulk_load_settings(cur)
+                cur.execute("""
+                    CREATE TEMP TABLE memo_kb_chunks_stage
+                    (LIKE memo_kb_chunks INCLUDING DEFAULTS)
+                    ON COMMIT DROP;
+                """)
+
+                # Each merged row also updates a live HNSW graph; merge in small
+                # slices as insert_chunks does. Bulk loads avoid this by calling
+                # drop_vector_indexes first
+                step = self.HNSW_LOAD_BATCH_SIZE if self._has_vector_index(cur) else None
+
+                total_inserted = 0
+                for df in frames:
+                    print(f"\nCopying {len(df)} chunks into database...")
+
+                    if step is None:
+                        parts = [df]
+                    else:
+                        parts = [df.iloc[i:i + step] for i in range(0, len(df), step)]
+
+                    for part in parts:
+                        buf = io.StringIO()
+                        for record in self._build_records(part):
+                            buf.write('\t'.join(self._copy_field(v) for v in record))
+                            buf.write('\n')
+                        buf.seek(0)
+
+                        cur.copy_expert(
+                            f"COPY memo_kb_chunks_stage ({columns}) FROM STDIN", buf
+                        )
+                        cur.execute(f"""
+                            INSERT INTO memo_kb_chunks ({columns})
+                            SELECT {columns} FROM memo_kb_chunks_stage
+                            ON CONFLICT (chunk_id) DO UPDATE SET
+                                chunk_text = EXCLUDED.chunk_text,
+                                embedding = EXCLUDED.embedding;
+                        """)
+                        total_inserted += cur.rowcount
+                        cur.execute("TRUNCATE memo_kb_chunks_stage;")
+
+                conn.commit()
+                cur.close()
+                self.clear_search_cache()
+
+                print(f"✓ Copied {total_inserted} chunks")
+                return total_inserted
+
+            except psycopg2.Error as e:
+                print(f"✗ COPY failed: {e}")
+                conn.rollback()
+                return 0
+
+    def _reset_sim_cache(self, dim: Optional[int] = None):
+        """(Re)allocate empty result cache storage; dim=None defers allocation"""
+        self._sim_cache.clear()
+        self._sim_filter_ids = {}
+        self._sim_next_filter_id = 0
+        self._sim_matrix = None
+        self._sim_slot_filter = None
+        self._sim_slot_keys = []
+        self._sim_slot_results = []
+        if dim is not None:
+            self._sim_matrix = np.zeros((self.sim_cache_size, dim), dtype=np.float32)
+            self._sim_slot_filter = np.full(self.sim_cache_size, -1, dtype=np.int64)
+            self._sim_slot_keys = [None] * self.sim_cache_size
+            self._sim_slot_results = [None] * self.sim_cache_size
+
+    def _sim_cache_lookup(self, query: np.ndarray, filters: tuple) -> Optional[List[Dict[str, Any]]]:
+        """
+        Return cached results for a near-duplicate query with the same filters
+
+        Args:
+            query: Unit-norm float32 query embedding
+            filters: Tuple of the remaining semantic_search arguments
+
+        Returns:
+            Copy of the cached result list, or None on a miss
+        """
+        with self._sim_cache_lock:
+            filter_id = self._sim_filter_ids.get(filters)
+            if filter_id is None or self._sim_matrix.shape[1] != query.shape[0]:
+                return None
+            sims = self._sim_matrix @ query
+            sims[self._sim_slot_filter != filter_id] = -np.inf
+            best = int(np.argmax(sims))
+            if sims[best] < self.sim_cache_threshold:
+                return None
+            self._sim_cache.move_to_end(self._sim_slot_keys[best])
+            return [dict(r) for r in self._sim_slot_results[best]]
+
+    def _sim_cache_store(self, query: np.ndarray, filters: tuple, results: List[Dict[str, Any]]):
+        """Cache search results, reusing the least recently used slot when full"""
+        key = (filters, np.round(query, 4).tobytes())
+        with self._sim_cache_lock:
+            matrix = self._sim_matrix
+            if matrix is None or matrix.shape != (self.sim_cache_size, query.shape[0]):
+                self._reset_sim_cache(query.shape[0])
+
+            slot = self._sim_cache.get(key)
+            if slot is None:
+                if len(self._sim_cache) < self.sim_cache_size:
+                    slot = len(self._sim_cache)
+                else:
+                    _, slot = self._sim_cache.popitem(last=False)
+                    evicted = int(self._sim_slot_filter[slot])
+                    self._sim_slot_filter[slot] = -1
+                    # Forget filter tuples no longer cached so the id map stays bounded
+                    if not (self._sim_slot_filter == evicted).any():
+                        self._sim_filter_ids = {
+                            f: i for f, i in self._sim_filter_ids.items() if i != evicted
+                        }
+                self._sim_cache[key] = slot
+
+            filter_id = self._sim_filter_ids.get(filters)
+            if filter_id is None:
+                filter_id = self._sim_filter_ids[filters] = self._sim_next_filter_id
+                self._sim_next_filter_id += 1
+            self._sim_matrix[slot] = query
+            self._sim_slot_filter[slot] = filter_id
+            self._sim_slot_keys[slot] = key
+            self._sim_slot_results[slot] = [dict(r) for r in results]
+            self._sim_cache.move_to_end(key)
+
+    def clear_search_cache(self):
+        """Drop cached search results (called after the table changes)"""
+        with self._sim_cache_lock:
+            self._reset_sim_cache()
+
+    def _prepare_search(self, conn, cur, query_template: str, names: List[str]) -> Optional[str]:
+        """
+        PREPARE the search SQL for this filter / field combination once per connection
+
+        Args:
+            conn: Pooled connection (tracks its prepared statements)
+            cur: Cursor on conn
+            query_template: Search SQL with {name} placeholders
+            names: Placeholder names in parameter order
+
+        Returns:
+            Prepared statement name, or None to fall back to ad-hoc SQL
+        """
+        if not self.vector_registered:
+            return None
+
+        # One statement per distinct SQL shape, numbered per connection
+        sql = query_template.format(**{n: f"${i}" for i, n in enumerate(names, 1)})
+        statement = conn.prepared.get(sql)
+        if statement:
+            return statement
+
+        statement = f"memo_search_{len(conn.prepared)}"
+        try:
+            cur.execute(f"PREPARE {statement} AS {sql};")
+        except psycopg2.Error as e:
+            print(f"⚠ PREPARE failed, using ad-hoc search SQL: {e}")
+            conn.rollback()
+            return None
+
+        conn.prepared[sql] = statement
+        return statement
+
+    def _fetch_ranked_fields(self, conn, ranked: List[Dict[str, Any]], fields: Tuple[str, ...]) -> List[Dict[str, Any]]:
+        """
+        Second stage of a two-stage search: fetch fields for ranked ids
+
+        Args:
+            conn: Connection holding the search transaction
+            ranked: {'id', 'similarity'} rows in rank order
+            fields: Fields to return per row
+
+        Returns:
+            Rows of the requested fields in the original rank order
+        """
+        columns = [f for f in fields if f != 'similarity']
+        by_id = {}
+        if columns and ranked:
+            cur = conn.cursor(cursor_factory=RealDictCursor)
+            cur.execute(
+                f"SELECT id, {', '.join(columns)} FROM memo_kb_chunks WHERE id = ANY(%s);",
+                ([row['id'] for row in ranked],)
+            )
+            by_id = {row['id']: row for row in cur.fetchall()}
+            cur.close()
+
+        rows = []
+        for row in ranked:
+            values = by_id.get(row['id'], {})
+            rows.append({
+                f: row['similarity'] if f == 'similarity' else values.get(f) for f in fields
+            })
+        return rows
+
     def semantic_search(
         self,
-        query_embedding: List[float],
+        query_embedding: Union[np.ndarray, List[float]],
         limit: int = 5,
         score_filter: Optional[int] = None,
-        borrower_filter: Optional[str] = None
+        borrower_filter: Optional[str] = None,
+        similarity_threshold: Optional[float] = None,
+        ef_search: Optional[int] = None,
+        fields: Optional[Tuple[str, ...]] = None,
+        two_stage: bool = False
     ) -> List[Dict[str, Any]]:
         """
         Perform semantic search using vector similarity
 
         Args:
-            query_embedding: Query embedding vector
+            query_embedding: Query embedding vector (bound as a float32
+                array through the pgvector adapter)
             limit: Maximum number of results
             score_filter: Optional filter by risk score
             borrower_filter: Optional filter by borrower type
+            similarity_threshold: Optional minimum similarity (0-1)
+            ef_search: Optional HNSW candidate list size for this query
+                (40 fast / pgvector default, 100 balanced, 200+ high recall)
+            fields: Optional subset of SEARCH_FIELDS to return (default: all),
+                e.g. ('chunk_id', 'similarity') for metadata-only re-ranking
+            two_stage: Rank on (id, similarity) only, then fetch the requested
+                fields for the top rows by primary key
 
         Returns:
             List of matching chunks with similarity scores
         """
-        if not self.conn:
+        if not self.pool:
             print("✗ Not connected to database")
             return []
 
-        try:
-            cur = self.conn.cursor()
-
-            # Build query with optional filters
-            where_clauses = []
-            params = []
-
-            if score_filter is not None:
-                where_clauses.append("score = %s")
-                params.append(score_filter)
-
-            if borrower_filter:
-                where_clauses.append("borrower ILIKE %s")
-                params.append(f"%{borrower_filter}%")
-
-            where_sql = ""
-            if where_clauses:
-                where_sql = "WHERE " + " AND ".join(where_clauses)
-
-            # Query using cosine distance (1 - cosine similarity)
-            query_sql = f"""
-                SELECT
-                    chunk_id,
-                    original_id,
-                    title,
-                    borrower,
-                    loan_type,
-                    chunk_text,
-                    score,
-                    recommendation,
-                    1 - (embedding <=> %s::vector) AS similarity
+        fields = tuple(fields) if fields else self.SEARCH_FIELDS
+        unknown = set(fields) - set(self.SEARCH_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown search fields: {sorted(unknown)}")
+
+        cache_query = None
+        filters = (limit, score_filter, borrower_filter, similarity_threshold, ef_search, fields)
+        if self.sim_cache_size > 0:
+            cache_query = np.asarray(query_embedding, dtype=np.float32)
+            norm = np.linalg.norm(cache_query)
+            if norm > 0:
+                cache_query = cache_query / norm
+            cached = self._sim_cache_lookup(cache_query, filters)
+            if cached is not None:
+                return cached
+
+        if not self.vector_registered:
+            # No pgvector adapter on this connection; fall back to an array literal
+            if isinstance(query_embedding, np.ndarray):
+                query_embedding = query_embedding.tolist()
+        else:
+            query_embedding = np.asarray(query_embedding, dtype=np.float32)
+
+        with self._acquire() as conn:
+            try:
+                cur = conn.cursor()
+
+                # Build query with optional filters. Placeholders are named so
+                # the same SQL serves both the prepared and ad-hoc paths
+                values = {'query': query_embedding, 'limit': limit}
+                where_clauses = []
+
+                if isinstance(score_filter, int) and score_filter <= self.HIGH_RISK_MAX_SCORE:
+                    # Literal, so even the generic prepared plan can match the
+                    # partial high-risk index (one statement per score value)
+                    where_clauses.append(f"score = {int(score_filter)}")
+                elif score_filter is not None:
+                    where_clauses.append("score = {score}")
+                    values['score'] = score_filter
+
+                if borrower_filter:
+                    where_clauses.append("borrower ILIKE {borrower}")
+                    values['borrower'] = f"%{borrower_filter}%"
+
+                where_sql = ""
+                if where_clauses:
+                    where_sql = "WHERE " + " AND ".join(where_clauses)
+
+                # The threshold is monotone in distance, so applying it to the
+                # top `limit` rows gives the same rows as filtering first
+                threshold_sql = ""
+                if similarity_threshold is not None:
+                    threshold_sql = "WHERE distance <= -{threshold}::float8"
+                    values['threshold'] = similarity_threshold
+
+                if two_stage:
+                    inner_columns = ["id"]
+                    outer_columns = ["id", "-distance AS similarity"]
+                else:
+                    inner_columns = [f for f in fields if f != 'similarity']
+                    outer_columns = [
+                        "-distance AS similarity" if f == 'similarity' else f for f in fields
+                    ]
+
+                # The query vector is referenced once: the inner query ranks on
+                # the inner product distance (<#>, HNSW-indexed) by alias and
+                # the outer query turns it into similarity. Embeddings are
+                # unit-norm so -(embedding <#> query) is the cosine similarity
+                query_template = f"""
+                    SELECT {", ".join(outer_columns)}
+                    FROM (
+                        SELECT {", ".join(inner_columns + [""])}
+                               embedding <#> {{query}}::{self.embedding_type} AS distance
+                        FROM memo_kb_chunks
+                        {where_sql}
+                        ORDER BY distance
+                        LIMIT {{limit}}
+                    ) ranked
+                    {threshold_sql}
+                    ORDER BY distance
+                """
+
+                statement = self._prepare_search(conn, cur, query_template, list(values))
+
+                if ef_search is not None:
+                    # Scoped to this transaction; committed below so it doesn't leak
+                    cur.execute("SET LOCAL hnsw.ef_search = %s", (int(ef_search),))
+
+                cur = conn.cursor(cursor_factory=RealDictCursor)
+                if statement:
+                    placeholders = ", ".join(["%s"] * len(values))
+                    cur.execute(f"EXECUTE {statement} ({placeholders});", list(values.values()))
+                else:
+                    query_sql = query_template.format(**{n: f"%({n})s" for n in values})
+                    cur.execute(query_sql, values)
+                rows = cur.fetchall()
+
+                if two_stage:
+                    rows = self._fetch_ranked_fields(conn, rows, fields)
+
+                results = [dict(row) for row in rows]
+                if 'similarity' in fields:
+                    for result in results:
+                        result['similarity'] = float(result['similarity'])
+
+                cur.close()
+                if ef_search is not None:
+                    conn.commit()
+
+                if cache_query is not None:
+                    self._sim_cache_store(cache_query, filters, results)
+                return results
+
+            except psycopg2.Error as e:
+                print(f"✗ Search failed: {e}")
+                conn.rollback()
+                return []
+
+    def batch_semantic_search(
+        self,
+        query_embeddings: Union[np.ndarray, List[List[float]]],
+        limit: int = 5,
+        score_filter: Optional[int] = None,
+        borrower_filter: Optional[str] = None,
+        similarity_threshold: Optional[float] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Run semantic_search for several query embeddings in one round-trip
+
+        Queries are sent as one vector array and expanded with UNNEST; a
+        LATERAL subquery does the per-query HNSW top-k.
+
+        Args:
+            query_embeddings: Query embedding vectors (rows of a 2-D array)
+            limit: Maximum number of results per query
+            score_filter: Optional filter by risk score
+            borrower_filter: Optional filter by borrower type
+            similarity_threshold: Optional minimum similarity (0-1)
+
+        Returns:
+            One list of matching chunks per query, in query order
+        """
+        if len(query_embeddings) == 0:
+            return []
+
+        if not self.pool:
+            print("✗ Not connected to database")
+            return [[] for _ in query_embeddings]
+
+        queries = [np.asarray(q, dtype=np.float32) for q in query_embeddings]
+        if not self.vector_registered:
+            # No pgvector adapter; send '[x1,...]' text elements instead
+            queries = [self._copy_field(q) for q in queries]
+
+        where_clauses = []
+        params = [queries]
+
+        if similarity_threshold is not None:
+            where_clauses.append("(embedding <#> q.emb) <= -%s")
+            params.append(similarity_threshold)
+
+        if score_filter is not None:
+            where_clauses.append("score = %s")
+            params.append(score_filter)
+
+        if borrower_filter:
+            where_clauses.append("borrower ILIKE %s")
+            params.append(f"%{borrower_filter}%")
+
+        params.append(limit)
+
+        where_sql = ""
+        if where_clauses:
+            where_sql = "WHERE " + " AND ".join(where_clauses)
+
+        columns = [f for f in self.SEARCH_FIELDS if f != 'similarity']
+        query_sql = f"""
+            SELECT q.qid, m.*
+            FROM unnest(%s::{self.embedding_type}[]) WITH ORDINALITY AS q(emb, qid),
+            LATERAL (
+                SELECT {", ".join(columns)},
+                       -(embedding <#> q.emb) AS similarity
                 FROM memo_kb_chunks
                 {where_sql}
-                ORDER BY embedding <=> %s::vector
-                LIMIT %s;
-            """
-
-            # Add embedding twice (for SELECT and ORDER BY) plus other params
-            all_params = [query_embedding] + params + [query_embedding, limit]
-
-            cur.execute(query_sql, all_params)
-
-            results = []
-            for row in cur.fetchall():
-                results.append({
-                    'chunk_id': row[0],
-                    'original_id': row[1],
-                    'title': row[2],
-                    'borrower': row[3],
-                    'loan_type': row[4],
-                    'chunk_text': row[5],
-                    'score': row[6],
-                    'recommendation': row[7],
-                    'similarity': float(row[8])
-                })
+                ORDER BY embedding <#> q.emb
+                LIMIT %s
+            ) m
+            ORDER BY q.qid, m.similarity DESC;
+        """
 
-            cur.close()
-            return results
+        with self._acquire() as conn:
+            try:
+                cur = conn.cursor()
+                cur.execute(query_sql, params)
 
-        except psycopg2.Error as e:
-            print(f"✗ Search failed: {e}")
-            return []
+                results = [[] for _ in queries]
+                for row in cur.fetchall():
+                    result = dict(zip(self.SEARCH_FIELDS, row[1:]))
+                    result['similarity'] = float(result['similarity'])
+                    results[row[0] - 1].append(result)
+
+                cur.close()
+                return results
+
+            except psycopg2.Error as e:
+                print(f"✗ Batch search failed: {e}")
+                conn.rollback()
+                return [[] for _ in queries]
+
+    def search_text(self, text: str, embedder, **kwargs) -> List[Dict[str, Any]]:
+        """
+        Embed a query string (memoized) and run semantic_search
+
+        Args:
+            text: Query text
+            embedder: RAGRetriever, SentenceTransformer, or any object with
+                encode() returning one vector per text
+            **kwargs: Passed through to semantic_search
+
+        Returns:
+            List of matching chunks with similarity scores
+        """
+        return self.semantic_search(self._embed_query(embedder, text), **kwargs)
+
+    def _embed_query(self, embedder, text: str) -> np.ndarray:
+        """Encode a query once per (embedder, text); returned array is read-only"""
+        if self.embed_cache_size <= 0:
+            return _encode_query(embedder, text)
+
+        with self._embed_cache_lock:
+            try:
+                cache = self._embed_cache.setdefault(embedder, OrderedDict())
+            except TypeError:
+                # Embedder can't be weakly referenced; encode without caching
+                cache = None
+            if cache is not None and text in cache:
+                cache.move_to_end(text)
+                return cache[text]
+
+        embedding = _encode_query(embedder, text)
+        embedding.flags.writeable = False
+
+        if cache is not None:
+            with self._embed_cache_lock:
+                cache[text] = embedding
+                cache.move_to_end(text)
+                while len(cache) > self.embed_cache_size:
+                    cache.popitem(last=False)
+        return embedding
 
     def get_statistics(self) -> Dict[str, Any]:
         """
@@ -338,47 +1154,43 @@ class VectorDatabase:
         Returns:
             Dictionary with database statistics
         """
-        if not self.conn:
+        if not self.pool:
             return {}
 
-        try:
-            cur = self.conn.cursor()
-
-            # Total chunks
-            cur.execute("SELECT COUNT(*) FROM memo_kb_chunks;")
-            total_chunks = cur.fetchone()[0]
-
-            # Chunks by score
-            cur.execute("""
-                SELECT score, COUNT(*)
-                FROM memo_kb_chunks
-                GROUP BY score
-                ORDER BY score;
-            """)
-            score_distribution = {row[0]: row[1] for row in cur.fetchall()}
-
-            # Top borrowers
-            cur.execute("""
-                SELECT borrower, COUNT(*) as count
-                FROM memo_kb_chunks
-                GROUP BY borrower
-                ORDER BY count DESC
-                LIMIT 10;
-            """)
-            top_borrowers = {row[0]: row[1] for row in cur.fetchall()}
-
-            cur.close()
-
-            return {
-                'total_chunks': total_chunks,
-                'score_distribution': score_distribution,
-                'top_borrowers': top_borrowers,
-                'embedding_dimension': self.embedding_dimension
-            }
-
-        except psycopg2.Error as e:
-            print(f"✗ Failed to get statistics: {e}")
-            return {}
+        with self._acquire() as conn:
+            try:
+                cur = conn.cursor()
+
+                # Count, score distribution and top borrowers in one round-trip.
+                # Pairs are aggregated as ordered JSON arrays so int keys and
+                # the count ordering survive
+                cur.execute("""
+                    SELECT
+                        (SELECT COUNT(*) FROM memo_kb_chunks),
+                        (SELECT COALESCE(json_agg(json_build_array(score, c) ORDER BY score), '[]')
+                         FROM (SELECT score, COUNT(*) AS c
+                               FROM memo_kb_chunks GROUP BY score) s),
+                        (SELECT COALESCE(json_agg(json_build_array(borrower, c) ORDER BY c DESC), '[]')
+                         FROM (SELECT borrower, COUNT(*) AS c
+                               FROM memo_kb_chunks GROUP BY borrower
+                               ORDER BY c DESC LIMIT 10) b);
+                """)
+                total_chunks, score_pairs, borrower_pairs = cur.fetchone()
+                score_distribution = dict(score_pairs)
+                top_borrowers = dict(borrower_pairs)
+
+                cur.close()
+
+                return {
+                    'total_chunks': total_chunks,
+                    'score_distribution': score_distribution,
+                    'top_borrowers': top_borrowers,
+                    'embedding_dimension': self.embedding_dimension
+                }
+
+            except psycopg2.Error as e:
+                print(f"✗ Failed to get statistics: {e}")
+                return {}
 
     def clear_database(self) -> bool:
         """
@@ -387,20 +1199,62 @@ class VectorDatabase:
         Returns:
             True if successful
         """
-        if not self.conn:
+        if not self.pool:
             return False
 
-        try:
-            cur = self.conn.cursor()
-            cur.execute("TRUNCATE TABLE memo_kb_chunks RESTART IDENTITY;")
-            self.conn.commit()
-            cur.close()
-            print("✓ Database cleared")
-            return True
-        except psycopg2.Error as e:
-            print(f"✗ Clear failed: {e}")
-            self.conn.rollback()
-            return False
+        with self._acquire() as conn:
+            try:
+                cur = conn.cursor()
+                cur.execute("TRUNCATE TABLE memo_kb_chunks RESTART IDENTITY;")
+                conn.commit()
+                cur.close()
+                self.clear_search_cache()
+                print("✓ Database cleared")
+                return True
+            except psycopg2.Error as e:
+                print(f"✗ Clear failed: {e}")
+                conn.rollback()
+                return False
+
+
+def _iter_chunk_frames(path: str, chunk_rows: int = LOAD_CHUNK_ROWS) -> Iterator[pd.DataFrame]:
+    """
+    Stream a chunk CSV or Parquet file as DataFrames of at most chunk_rows rows
+
+    Args:
+        path: Path to CSV or .parquet file with embeddings
+        chunk_rows: Rows per yielded DataFrame
+
+    Yields:
+        DataFrame chunks in file order
+    """
+    if path.endswith('.parquet'):
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_rows):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, chunksize=chunk_rows, dtype=CSV_DTYPES)
+
+
+def _load_partition(args: Tuple[pd.DataFrame, Dict[str, Any]]) -> Tuple[int, bool]:
+    """
+    Worker for parallel loads: COPY one DataFrame chunk on its own connection
+
+    Args:
+        args: (partition DataFrame, VectorDatabase keyword arguments)
+
+    Returns:
+        (rows loaded, ok) - ok is False if the worker could not connect or
+        did not load every row of its partition
+    """
+    partition, db_kwargs = args
+    db = VectorDatabase(max_connections=1, **db_kwargs)
+    if not db.connect():
+        return 0, False
+    try:
+        loaded = db.insert_chunks_copy(partition)
+        return loaded, loaded == len(partition)
+    finally:
+        db.disconnect()
 
 
 def load_knowledge_base_from_csv(
@@ -410,15 +1264,28 @@ def load_knowledge_base_from_csv(
     db_name: Optional[str] = None,
     db_user: Optional[str] = None,
     db_password: Optional[str] = None,
-    embedding_dim: int = 768
+    embedding_dim: int = 768,
+    embedding_type: Optional[str] = None,
+    workers: int = 4
 ) -> bool:
     """
-    Complete pipeline: Load chunks from CSV into vector database
+    Complete pipeline: Load chunks from CSV (or Parquet) into vector database
+
+    Runs create table -> drop HNSW indexes -> chunked COPY load -> build HNSW
+    indexes, so the graphs are built once rather than updated per inserted row
+    (also on reloads into an existing table). A serial load runs in one
+    transaction committed at the end; a parallel load commits each worker's
+    chunk separately. If any chunk fails, the load is reported as failed (for
+    parallel loads, rows from chunks that did commit remain) and no index is
+    built.
 
     Args:
-        csv_path: Path to CSV with embeddings
+        csv_path: Path to CSV or .parquet file with embeddings
         db_host, db_port, db_name, db_user, db_password: Database credentials
         embedding_dim: Embedding dimension
+        embedding_type: 'vector' or 'halfvec' column storage (see VectorDatabase)
+        workers: Parallel COPY workers, each with its own connection (files
+            that fit in one LOAD_CHUNK_ROWS chunk are loaded in-process)
 
     Returns:
         True if successful
@@ -427,40 +1294,91 @@ def load_knowledge_base_from_csv(
     print("Loading Knowledge Base into Vector Database")
     print("="*60 + "\n")
 
-    # Load CSV
-    print(f"1. Loading data from: {csv_path}")
-    df = pd.read_csv(csv_path)
-    print(f"   ✓ Loaded {len(df)} chunks")
+    # Stream the file in chunks so memory stays O(chunk), not O(file)
+    print(f"1. Streaming data from: {csv_path}")
+    frames = _iter_chunk_frames(csv_path)
 
     # Initialize database
     print(f"\n2. Connecting to database...")
-    db = VectorDatabase(
+    db_kwargs = dict(
         host=db_host,
         port=db_port,
         database=db_name,
         user=db_user,
-        password=db_password
+        password=db_password,
+        embedding_type=embedding_type
     )
+    db = VectorDatabase(**db_kwargs)
 
     if not db.connect():
         return False
 
-    # Setup schema
+    # Setup schema (vector index is built after the load)
     print(f"\n3. Setting up database schema...")
-    if not db.setup_database(embedding_dim=embedding_dim):
+    if not db.create_table(embedding_dim=embedding_dim):
         db.disconnect()
         return False
 
-    # Insert chunks
+    # Reloads hit an existing table; drop its HNSW indexes so rows aren't
+    # added to the graphs one at a time
+    if not db.drop_vector_indexes():
+        db.disconnect()
+        return False
+
+    # Bulk load chunks; multi-chunk files are spread across worker processes
     print(f"\n4. Inserting chunks...")
-    inserted = db.insert_chunks(df)
+    first = next(frames, None)
+    second = next(frames, None)
+    if second is not None and workers > 1:
+        print(f"   Loading with {workers} parallel workers...")
+        tasks = ((frame, db_kwargs) for frame in chain([first, second], frames))
+        inserted = failed = 0
+        with multiprocessing.Pool(workers) as pool:
+            # One wave of `workers` chunks at a time keeps memory bounded
+            while True:
+                wave = list(islice(tasks, workers))
+                if not wave:
+                    break
+                for loaded, ok in pool.map(_load_partition, wave):
+                    inserted += loaded
+                    failed += not ok
+                # Any failed partition fails the load; don't start another wave
+                if failed:
+                    break
+        db.clear_search_cache()
+    else:
+        # One transaction for the whole file, committed once at the end
+        rows_read = [0]
+
+        def counted(chunks):
+            for frame in chunks:
+                if frame is not None:
+                    rows_read[0] += len(frame)
+                    yield frame
+
+        inserted = db.insert_chunks_copy(counted(chain([first, second], frames)))
+        # Every row is upserted, so a short count means the load was rolled back
+        failed = int(inserted != rows_read[0])
+
+    if failed:
+        print(f"   ✗ Load failed ({failed} chunk(s); {inserted} rows committed)")
+        db.disconnect()
+        return False
+
+    print(f"   ✓ Loaded {inserted} chunks")
 
     if inserted == 0:
         db.disconnect()
         return False
 
+    # Build HNSW index over the loaded rows
+    print(f"\n5. Building vector index...")
+    if not db.create_vector_index():
+        db.disconnect()
+        return False
+
     # Show statistics
-    print(f"\n5. Database statistics:")
+    print(f"\n6. Database statistics:")
     stats = db.get_statistics()
     print(f"   Total chunks: {stats.get('total_chunks', 0)}")
     print(f"   Risk score distribution: {stats.get('score_distribution', {})}")
@@ -480,12 +1398,14 @@ if __name__ == "__main__":
     if len(sys.argv) > 1:
         csv_file = sys.argv[1]
     else:
-        csv_file = "rag_data/credit_memo_chunks_with_embeddings.csv"
+        csv_file = "rag_data/credit_memo_chunks_with_embeddings.parquet"
+        if not os.path.exists(csv_file):
+            csv_file = "rag_data/credit_memo_chunks_with_embeddings.csv"
 
     if not os.path.exists(csv_file):
         print(f"Error: CSV file not found: {csv_file}")
         print("\nUsage:")
-        print("  python rag_vector_db.py <csv_path>")
+        print("  python rag_vector_db.py <csv_or_parquet_path>")
         print("\nExample:")
         print("  python rag_vector_db.py rag_data/credit_memo_chunks_with_embeddings.csv")
         sys.exit(1)
@@ -3,12 +3,302 @@ Word Document Generator for Credit Memos
 Generates professionally formatted .docx files with auto-populated fields
 """
 
-from docx import Document
-from docx.shared import Inches, Pt, RGBColor
-from docx.enum.text import WD_ALIGN_PARAGRAPH
-from docx.enum.table import WD_TABLE_ALIGNMENT, WD_ALIGN_VERTICAL
+from concurrent.futures import ProcessPoolExecutor
+from copy import deepcopy
+from dataclasses import dataclass
+from functools import lru_cache, partial
 from datetime import datetime
+from io import BytesIO
+import importlib.util
+import json
+import multiprocessing
 import os
+import re
+import sys
+import threading
+from types import MappingProxyType
+import zipfile
+from xml.sax.saxutils import escape
+
+# orjson parses serve() job lines and encodes audit dumps in C; fall back to the stdlib
+try:
+    import orjson
+    from orjson import loads as _json_loads
+
+    def _json_dumps(obj):
+        """Compact JSON text for logging"""
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode('utf-8')
+except ImportError:
+    _json_loads = json.loads
+
+    def _json_dumps(obj):
+        """Compact JSON text for logging"""
+        return json.dumps(obj, separators=(',', ':'), ensure_ascii=False, default=str)
+
+
+# python-docx (and lxml) are imported on first use by _lazy_docx(), so importing
+# this module stays cheap in processes that never render a memo
+Document = Inches = Pt = RGBColor = None
+WD_ALIGN_PARAGRAPH = WD_TAB_ALIGNMENT = WD_TAB_LEADER = None
+WD_TABLE_ALIGNMENT = WD_ALIGN_VERTICAL = None
+OxmlElement = parse_xml = nsdecls = qn = SubElement = None
+
+# WordprocessingML tags (Clark notation, so no python-docx import is needed)
+_W = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+_W_P, _W_PPR, _W_JC = _W + 'p', _W + 'pPr', _W + 'jc'
+_W_R, _W_RPR, _W_T = _W + 'r', _W + 'rPr', _W + 't'
+_W_B, _W_COLOR, _W_SZ = _W + 'b', _W + 'color', _W + 'sz'
+_W_VAL, _W_TC, _W_SECTPR = _W + 'val', _W + 'tc', _W + 'sectPr'
+_XML_SPACE = '{http://www.w3.org/XML/1998/namespace}space'
+
+# Colors (RGBColor instances, set by _lazy_docx)
+_RED = _GREEN = _ORANGE = None
+_BANK_GREEN = _DARK_GRAY = _MED_GRAY = _DARK_BLUE = None
+_FOOTER_GRAY = _ERNIE_GRAY = None
+_STATUS_COLOR = {}
+
+# Serialized template document, built on first use by _template_bytes()
+_TEMPLATE_BYTES = None
+
+# FastMemoWriter state: Jinja body template and the split template package, built on first use
+_TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'templates')
+_BODY_TEMPLATE = None
+_FAST_TEMPLATE = None
+
+# Guards the lazy template builds when memos are rendered from several threads
+# (reentrant: _fast_template builds through _template_bytes)
+_TEMPLATE_LOCK = threading.RLock()
+
+
+def _lazy_docx():
+    """Import python-docx and build the color constants on first use"""
+    global Document, Inches, Pt, RGBColor, WD_ALIGN_PARAGRAPH, WD_TAB_ALIGNMENT, WD_TAB_LEADER
+    global WD_TABLE_ALIGNMENT, WD_ALIGN_VERTICAL, OxmlElement, parse_xml, nsdecls, qn, SubElement
+    global _RED, _GREEN, _ORANGE, _BANK_GREEN, _DARK_GRAY, _MED_GRAY, _DARK_BLUE
+    global _FOOTER_GRAY, _ERNIE_GRAY
+
+    if Document is not None:
+        return
+
+    from docx import Document as _Document
+    from docx.shared import Inches, Pt, RGBColor
+    from docx.enum.text import WD_ALIGN_PARAGRAPH, WD_TAB_ALIGNMENT, WD_TAB_LEADER
+    from docx.enum.table import WD_TABLE_ALIGNMENT, WD_ALIGN_VERTICAL
+    from docx.oxml import OxmlElement, parse_xml
+    from docx.oxml.ns import nsdecls, qn
+    from lxml.etree import SubElement
+
+    _RED = RGBColor(255, 0, 0)
+    _GREEN = RGBColor(0, 128, 0)
+    _ORANGE = RGBColor(255, 165, 0)
+    _BANK_GREEN = RGBColor(0, 103, 71)  # Banking green (#006747)
+    _DARK_GRAY = RGBColor(51, 51, 51)
+    _MED_GRAY = RGBColor(102, 102, 102)
+    _DARK_BLUE = RGBColor(0, 51, 102)
+    _FOOTER_GRAY = RGBColor(128, 128, 128)
+    _ERNIE_GRAY = RGBColor(150, 150, 150)
+
+    _STATUS_COLOR.update({
+        'healthy': _GREEN, 'good': _GREEN,
+        'watch': _ORANGE, 'fair': _ORANGE,
+        'concern': _RED, 'poor': _RED,
+    })
+
+    Document = _Document
+
+
+# Interpretation keyword patterns (the recommendation does not count 'negative')
+_POS_RE = re.compile(r'strong|excellent|good|healthy|positive', re.I)
+_NEG_RE = re.compile(r'weak|concern|low|risk|slow|negative', re.I)
+_REC_NEG_RE = re.compile(r'weak|concern|low|risk', re.I)
+
+# Fallback bullets when no interpretation matches
+_DEFAULT_STRENGTHS = (
+    "Established business with operating history",
+    "Experienced management team",
+    "Banking relationship maintained"
+)
+_DEFAULT_CONCERNS = (
+    "Economic conditions may impact industry performance",
+    "Competition in market requires ongoing monitoring",
+    "Regular financial reporting required to track trends"
+)
+
+# Ratios table rows: (label, ratio key, threshold text)
+_RATIO_ROWS = (
+    ("Debt Service Coverage (DSCR)", "dscr", "≥1.25x"),
+    ("Total Debt to EBITDA", "debt_to_ebitda", "≤2.0x"),
+    ("Current Ratio", "current_ratio", "≥2.0x"),
+    ("Quick Ratio", "quick_ratio", "≥1.0x"),
+    ("Net Income Margin", "net_income_margin", "≥10%"),
+    ("Interest Coverage", "interest_coverage", "≥3.0x"),
+    ("Leverage Ratio", "leverage_ratio", "≤0.3"),
+    ("Working Capital", "working_capital", ">$0"),
+    ("Days Sales Outstanding", "dso", "≤45 days"),
+)
+
+# Ratios table data row for the python-docx path, %-formatted with escaped text
+_RATIO_ROW_XML = (
+    '<w:tr>'
+    '<w:tc><w:tcPr><w:tcW w:type="dxa" w:w="%(width)s"/></w:tcPr>'
+    '<w:p><w:r><w:t xml:space="preserve">%(name)s</w:t></w:r></w:p></w:tc>'
+    '<w:tc><w:tcPr><w:tcW w:type="dxa" w:w="%(width)s"/></w:tcPr>'
+    '<w:p><w:pPr><w:jc w:val="center"/></w:pPr><w:r><w:t xml:space="preserve">%(value)s</w:t></w:r></w:p></w:tc>'
+    '<w:tc><w:tcPr><w:tcW w:type="dxa" w:w="%(width)s"/></w:tcPr>'
+    '<w:p><w:pPr><w:jc w:val="center"/></w:pPr><w:r><w:t xml:space="preserve">%(threshold)s</w:t></w:r></w:p></w:tc>'
+    '<w:tc><w:tcPr><w:tcW w:type="dxa" w:w="%(width)s"/></w:tcPr>'
+    '<w:p><w:pPr><w:jc w:val="center"/></w:pPr><w:r><w:rPr><w:b/>%(color)s</w:rPr>'
+    '<w:t xml:space="preserve">%(status)s</w:t></w:r></w:p></w:tc>'
+    '</w:tr>'
+)
+
+_RATIO_HEADERS = ("Ratio", "Value", "Threshold", "Status")
+
+# Ratio thresholds: (healthy, watch, inverse) - inverse means lower is better
+_THRESHOLDS = MappingProxyType({
+    'dscr': (1.25, 1.0, False),
+    'debt_to_ebitda': (2.0, 4.0, True),
+    'current_ratio': (2.0, 1.0, False),
+    'quick_ratio': (1.0, 0.5, False),
+    'net_income_margin': (10.0, 5.0, False),
+    'interest_coverage': (3.0, 2.0, False),
+    'leverage_ratio': (0.3, 0.6, True),
+    'working_capital': (0, 0, False),
+    'dso': (45, 60, True),
+})
+
+
+@dataclass
+class ClassificationResult:
+    """Ratio classification shared by the memo sections"""
+    __slots__ = ('strengths', 'concerns', 'recommendation', 'risk_level', 'risk_desc')
+
+    strengths: list
+    concerns: list
+    recommendation: str
+    risk_level: str
+    risk_desc: str
+
+
+@dataclass
+class MemoContext:
+    """
+    Borrower and financial fields unpacked once per memo
+    (borrower text fields are None when missing; each section applies its own default)
+    """
+    __slots__ = (
+        'borrower_name', 'industry', 'loan_type', 'purpose', 'loan_officer', 'credit_analyst',
+        'loan_amount_fmt', 'risk_rating',
+        'revenue', 'ebitda', 'revenue_fmt', 'net_income_fmt', 'ebitda_fmt',
+        'total_assets_fmt', 'total_liabilities_fmt', 'equity_fmt'
+    )
+
+    borrower_name: str
+    industry: str
+    loan_type: str
+    purpose: str
+    loan_officer: str
+    credit_analyst: str
+    loan_amount_fmt: str
+    risk_rating: str
+    revenue: float
+    ebitda: float
+    revenue_fmt: str
+    net_income_fmt: str
+    ebitda_fmt: str
+    total_assets_fmt: str
+    total_liabilities_fmt: str
+    equity_fmt: str
+
+
+def _or_default(value, default):
+    """Return value, or default when it is None"""
+    return default if value is None else value
+
+
+def _add_hrule(container):
+    """
+    Append an empty paragraph with a bottom border as a horizontal rule
+
+    Args:
+        container: Document, header or footer to append to
+    """
+    p_pr = container.add_paragraph()._p.get_or_add_pPr()
+    p_bdr = OxmlElement('w:pBdr')
+    bottom = OxmlElement('w:bottom')
+    for attr, value in (('w:val', 'single'), ('w:sz', '6'), ('w:space', '1'), ('w:color', 'auto')):
+        bottom.set(qn(attr), value)
+    p_bdr.append(bottom)
+    p_pr.append(p_bdr)
+
+
+@lru_cache(maxsize=256)
+def _format_currency(value):
+    """Format number as currency (cached by value)"""
+    try:
+        return "N/A" if value is None else f"${value:,.0f}"
+    except (ValueError, TypeError):
+        return "N/A"
+
+
+@lru_cache(maxsize=256)
+def _format_ratio(value):
+    """Format a coverage/multiple ratio as e.g. 1.25x (cached by value)"""
+    return f"{value:.2f}x"
+
+
+def _fast_set_cell(tc, text, bold=False, align=None, font_size=None, color=None):
+    """
+    Replace a table cell's content with a single run, building the XML directly
+
+    Args:
+        tc: CT_Tc cell element
+        text: Cell text
+        bold: Bold run
+        align: WD_ALIGN_PARAGRAPH value for the paragraph
+        font_size: Font size in points
+        color: RGBColor for the run
+    """
+    tc.clear_content()
+    p = SubElement(tc, _W_P)
+    if align is not None:
+        SubElement(SubElement(p, _W_PPR), _W_JC).set(_W_VAL, align.xml_value)
+
+    r = SubElement(p, _W_R)
+    if bold or font_size or color is not None:
+        rpr = SubElement(r, _W_RPR)
+        if bold:
+            SubElement(rpr, _W_B)
+        if color is not None:
+            SubElement(rpr, _W_COLOR).set(_W_VAL, str(color))
+        if font_size:
+            SubElement(rpr, _W_SZ).set(_W_VAL, str(int(font_size * 2)))
+
+    t = SubElement(r, _W_T)
+    t.text = text
+    if text != text.strip():
+        t.set(_XML_SPACE, 'preserve')
+
+
+@lru_cache(maxsize=8)
+def _ratio_header_row(width):
+    """
+    Parse the ratios table header row once per column width
+
+    Args:
+        width: Cell width in twips
+
+    Returns:
+        <w:tr> element to deepcopy into each memo's table
+    """
+    return parse_xml(
+        f'<w:tr {nsdecls("w")}>' + ''.join(
+            f'<w:tc><w:tcPr><w:tcW w:type="dxa" w:w="{width}"/></w:tcPr>'
+            f'<w:p><w:pPr><w:jc w:val="center"/></w:pPr>'
+            f'<w:r><w:rPr><w:b/></w:rPr><w:t>{header}</w:t></w:r></w:p></w:tc>'
+            for header in _RATIO_HEADERS
+        ) + '</w:tr>'
+    )
 
 
 class CreditMemoWordGenerator:
@@ -17,9 +307,43 @@ class CreditMemoWordGenerator:
     Midwest Regional Bank template standards
     """
 
-    def __init__(self):
-        self.document = Document()
-        self._setup_styles()
+    def __init__(self, write_buffer_size=1024 * 1024):
+        """
+        Args:
+            write_buffer_size: Buffer size in bytes for writing the .docx
+                (raise for network-mounted output directories)
+        """
+        _lazy_docx()
+        self.write_buffer_size = write_buffer_size
+        self._reset()
+
+    def _reset(self):
+        """Start a fresh memo from the pre-built template"""
+        # Clone the template (styles, header, footer, static sections)
+        self.document = Document(BytesIO(_template_bytes()))
+
+        # Detach the static sections; they are re-attached after the recommendation
+        body = self.document.element.body
+        self._static_sections = [el for el in body.iterchildren() if el.tag != _W_SECTPR]
+        for el in self._static_sections:
+            body.remove(el)
+
+    def _add_bullets(self, items):
+        """Append List Bullet paragraphs built as one XML fragment"""
+        style_id = self.document.styles['List Bullet'].style_id
+        fragment = parse_xml(
+            f'<w:body {nsdecls("w")}>' + ''.join(
+                f'<w:p><w:pPr><w:pStyle w:val="{style_id}"/></w:pPr>'
+                f'<w:r><w:t xml:space="preserve">{escape(item)}</w:t></w:r></w:p>'
+                for item in items
+            ) + '</w:body>'
+        )
+
+        # Extend the body in one call, then move sectPr back to the end
+        body = self.document.element.body
+        sect_pr = body.sectPr
+        body.extend(fragment)
+        body.append(sect_pr)
 
     def _setup_styles(self):
         """Configure document styles"""
@@ -29,6 +353,9 @@ class CreditMemoWordGenerator:
         font.name = 'Calibri'
         font.size = Pt(11)
 
+        # Section headings carry their own leading space instead of empty spacer paragraphs
+        self.document.styles['Heading 1'].paragraph_format.space_before = Pt(36)
+
         # Margins (1 inch all sides)
         sections = self.document.sections
         for section in sections:
@@ -45,13 +372,18 @@ class CreditMemoWordGenerator:
         Args:
             extracted_data: Dict of financial data from ADE
             ratios: Dict of calculated financial ratios
-            memo_narrative: Generated credit memo text
+            memo_narrative: Unused; reserved for an analyst narrative section
+                (the document is built from the structured data)
             borrower_info: Dict with borrower_name, industry, loan_amount, etc.
-            output_path: Path to save .docx file
+            output_path: Path to save .docx file, or a writable binary file-like object
+
+        Returns:
+            output_path
         """
 
-        # Add header
-        self._add_header()
+        # Unpack inputs and classify ratios once for all sections
+        ctx = self._build_context(extracted_data, borrower_info)
+        classification = self._classify_ratios(ratios)
 
         # Add confidential marking
         self._add_confidential_marking()
@@ -60,18 +392,18 @@ class CreditMemoWordGenerator:
         self._add_title("CREDIT MEMORANDUM")
 
         # Add loan information section
-        self._add_loan_info_section(borrower_info, extracted_data)
+        self._add_loan_info_section(ctx)
 
         # Add executive summary
         self._add_section_heading("EXECUTIVE SUMMARY & RECOMMENDATION")
-        self._add_executive_summary(borrower_info, ratios)
+        self._add_executive_summary(ctx, ratios, classification)
 
         # Add 5 C's analysis
-        self._add_five_cs_analysis(extracted_data, ratios, borrower_info)
+        self._add_five_cs_analysis(ctx)
 
         # Add financial performance table
         self._add_section_heading("HISTORICAL FINANCIAL PERFORMANCE")
-        self._add_financial_table(extracted_data)
+        self._add_financial_table(ctx)
 
         # Add financial ratios table
         self._add_section_heading("FINANCIAL RATIOS ANALYSIS")
@@ -79,23 +411,25 @@ class CreditMemoWordGenerator:
 
         # Add risk assessment
         self._add_section_heading("RISK ASSESSMENT")
-        self._add_risk_assessment(ratios)
+        self._add_risk_assessment(classification)
 
         # Add strengths and concerns
-        self._add_strengths_concerns(ratios)
+        self._add_strengths_concerns(classification)
 
         # Add recommendation
         self._add_section_heading("RECOMMENDATION")
-        self._add_recommendation(borrower_info, ratios)
+        self._add_recommendation(ctx, classification)
 
-        # Add signature block
-        self._add_signature_block()
+        # Conditions, monitoring and signature block come from the template
+        self._attach_static_sections()
 
-        # Add footer
-        self._add_footer()
-
-        # Save document
-        self.document.save(output_path)
+        # Save document: file-like outputs (e.g. BytesIO for HTTP/S3) are written directly,
+        # paths go through a buffered handle to coalesce small zip writes
+        if hasattr(output_path, 'write'):
+            self.document.save(output_path)
+        else:
+            with open(output_path, 'wb', buffering=self.write_buffer_size) as f:
+                self.document.save(f)
 
         return output_path
 
@@ -104,60 +438,52 @@ class CreditMemoWordGenerator:
         section = self.document.sections[0]
         header = section.header
 
-        # Bank name
-        bank_para = header.paragraphs[0]
-        bank_para.text = "MIDWEST REGIONAL BANK"
-        bank_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
-        bank_run = bank_para.runs[0]
+        # Bank name, division and FDIC tagline as line-broken runs of one paragraph
+        header_para = header.paragraphs[0]
+        header_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
+
+        bank_run = header_para.add_run("MIDWEST REGIONAL BANK")
         bank_run.font.size = Pt(14)
         bank_run.font.bold = True
-        bank_run.font.color.rgb = RGBColor(0, 103, 71)  # Banking green (#006747)
+        bank_run.font.color.rgb = _BANK_GREEN
 
-        # Division name
-        division = header.add_paragraph()
-        division.text = "Business & Commercial Finance"
-        division.alignment = WD_ALIGN_PARAGRAPH.CENTER
-        division_run = division.runs[0]
+        division_run = header_para.add_run()
+        division_run.add_break()
+        division_run.add_text("Business & Commercial Finance")
         division_run.font.size = Pt(11)
         division_run.font.italic = False
-        division_run.font.color.rgb = RGBColor(51, 51, 51)  # Dark gray
+        division_run.font.color.rgb = _DARK_GRAY
 
-        # FDIC tagline
-        fdic = header.add_paragraph()
-        fdic.text = "Member FDIC"
-        fdic.alignment = WD_ALIGN_PARAGRAPH.CENTER
-        fdic_run = fdic.runs[0]
+        fdic_run = header_para.add_run()
+        fdic_run.add_break()
+        fdic_run.add_text("Member FDIC")
         fdic_run.font.size = Pt(9)
         fdic_run.font.italic = True
-        fdic_run.font.color.rgb = RGBColor(102, 102, 102)  # Medium gray
+        fdic_run.font.color.rgb = _MED_GRAY
 
         # Add separator line
-        header.add_paragraph("_" * 80).alignment = WD_ALIGN_PARAGRAPH.CENTER
+        _add_hrule(header)
 
     def _add_confidential_marking(self):
         """Add confidential marking"""
         conf_para = self.document.add_paragraph()
-        conf_para.text = "CONFIDENTIAL - INTERNAL USE ONLY"
         conf_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
-        conf_run = conf_para.runs[0]
+        conf_run = conf_para.add_run("CONFIDENTIAL - INTERNAL USE ONLY")
         conf_run.font.bold = True
         conf_run.font.size = Pt(10)
-        conf_run.font.color.rgb = RGBColor(255, 0, 0)  # Red
-
-        self.document.add_paragraph()  # Spacing
+        conf_run.font.color.rgb = _RED
+        conf_para.paragraph_format.space_after = Pt(24)
 
     def _add_title(self, title_text):
         """Add document title"""
         title = self.document.add_paragraph()
-        title.text = title_text
         title.alignment = WD_ALIGN_PARAGRAPH.CENTER
-        title_run = title.runs[0]
+        title_run = title.add_run(title_text)
         title_run.font.size = Pt(16)
         title_run.font.bold = True
+        title.paragraph_format.space_after = Pt(24)
 
-        self.document.add_paragraph()  # Spacing
-
-    def _add_loan_info_section(self, borrower_info, extracted_data):
+    def _add_loan_info_section(self, ctx):
         """Add loan information table"""
         table = self.document.add_table(rows=9, cols=2)
         table.style = 'Light Grid Accent 1'
@@ -167,39 +493,35 @@ class CreditMemoWordGenerator:
         table.columns[1].width = Inches(4.0)
 
         # Populate table
-        info_items = [
-            ("Borrower:", borrower_info.get('borrower_name', 'N/A')),
-            ("Industry:", borrower_info.get('industry', 'N/A')),
-            ("Loan Type:", borrower_info.get('loan_type', 'Commercial Term Loan')),
-            ("Requested Amount:", self._format_currency(borrower_info.get('loan_amount', 0))),
-            ("Purpose:", borrower_info.get('purpose', 'Working capital and business expansion')),
+        cells = list(table._tbl.iter(_W_TC))
+        for i, (label, value) in enumerate(self._loan_info_items(ctx)):
+            _fast_set_cell(cells[2 * i], label, bold=True)
+            _fast_set_cell(cells[2 * i + 1], value)
+
+    def _loan_info_items(self, ctx):
+        """Build the (label, value) rows of the loan information table"""
+        return [
+            ("Borrower:", str(_or_default(ctx.borrower_name, 'N/A'))),
+            ("Industry:", str(_or_default(ctx.industry, 'N/A'))),
+            ("Loan Type:", str(_or_default(ctx.loan_type, 'Commercial Term Loan'))),
+            ("Requested Amount:", ctx.loan_amount_fmt),
+            ("Purpose:", str(_or_default(ctx.purpose, 'Working capital and business expansion'))),
             ("Date:", datetime.now().strftime("%B %d, %Y")),
-            ("Loan Officer:", borrower_info.get('loan_officer', '[Loan Officer Name]')),
-            ("Credit Analyst:", borrower_info.get('credit_analyst', '[Credit Analyst Name]')),
-            ("Risk Rating:", self._determine_risk_rating(extracted_data))
+            ("Loan Officer:", str(_or_default(ctx.loan_officer, '[Loan Officer Name]'))),
+            ("Credit Analyst:", str(_or_default(ctx.credit_analyst, '[Credit Analyst Name]'))),
+            ("Risk Rating:", str(ctx.risk_rating))
         ]
 
-        for i, (label, value) in enumerate(info_items):
-            row = table.rows[i]
-            row.cells[0].text = label
-            row.cells[0].paragraphs[0].runs[0].font.bold = True
-            row.cells[1].text = str(value)
-
-        self.document.add_paragraph()  # Spacing
-
     def _add_section_heading(self, heading_text):
-        """Add formatted section heading"""
-        self.document.add_paragraph()  # Spacing before
-
-        heading = self.document.add_heading(heading_text, level=1)
-        heading_run = heading.runs[0]
-        heading_run.font.color.rgb = RGBColor(0, 51, 102)  # Dark blue
+        """Add formatted section heading (spacing before comes from the Heading 1 style)"""
+        heading_run = self.document.add_heading(level=1).add_run(heading_text)
+        heading_run.font.color.rgb = _DARK_BLUE
         heading_run.font.size = Pt(14)
 
-    def _add_executive_summary(self, borrower_info, ratios):
+    def _add_executive_summary(self, ctx, ratios, classification):
         """Add executive summary with recommendation"""
         # Recommendation badge
-        recommendation = self._determine_recommendation(ratios)
+        recommendation = classification.recommendation
         rec_para = self.document.add_paragraph()
         rec_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
         rec_run = rec_para.add_run(f"RECOMMENDATION: {recommendation}")
@@ -207,21 +529,37 @@ class CreditMemoWordGenerator:
         rec_run.font.size = Pt(12)
 
         # Color code recommendation
-        if "APPROVED" in recommendation:
-            rec_run.font.color.rgb = RGBColor(0, 128, 0)  # Green
-        elif "DECLINED" in recommendation:
-            rec_run.font.color.rgb = RGBColor(255, 0, 0)  # Red
-        else:
-            rec_run.font.color.rgb = RGBColor(255, 165, 0)  # Orange
+        rec_run.font.color.rgb = self._recommendation_color(recommendation)
+
+        rec_para.paragraph_format.space_after = Pt(24)
+
+        # Summary narrative (single run)
+        self.document.add_paragraph().add_run(self._summary_text(ctx, ratios))
 
-        self.document.add_paragraph()  # Spacing
+        # Primary repayment source
+        repayment = self.document.add_paragraph()
+        repayment.add_run("Primary Repayment Source: ").bold = True
+        repayment.add_run("Operating cash flow from business operations")
+
+        # Secondary repayment source
+        secondary = self.document.add_paragraph()
+        secondary.add_run("Secondary Repayment Source: ").bold = True
+        secondary.add_run("Liquidation of business assets and personal guarantees")
 
-        # Summary narrative
-        summary = self.document.add_paragraph()
-        summary.add_run(
-            f"{borrower_info.get('borrower_name', 'The borrower')} requests "
-            f"{self._format_currency(borrower_info.get('loan_amount', 0))} for "
-            f"{borrower_info.get('purpose', 'business purposes')}. "
+    def _recommendation_color(self, recommendation):
+        """Color for the recommendation badge"""
+        if "APPROVED" in recommendation:
+            return _GREEN
+        elif "DECLINED" in recommendation:
+            return _RED
+        return _ORANGE
+
+    def _summary_text(self, ctx, ratios):
+        """Build the executive summary narrative, including the DSCR highlight"""
+        summary_text = (
+            f"{_or_default(ctx.borrower_name, 'The borrower')} requests "
+            f"{ctx.loan_amount_fmt} for "
+            f"{_or_default(ctx.purpose, 'business purposes')}. "
         )
 
         # Add DSCR highlight
@@ -230,88 +568,66 @@ class CreditMemoWordGenerator:
             dscr = dscr.get('value', 0)
 
         if dscr and isinstance(dscr, (int, float)):
-            summary.add_run(
-                f"The company demonstrates a Debt Service Coverage Ratio of {dscr:.2f}x, "
-            )
-
             if dscr >= 1.25:
-                summary.add_run("indicating strong repayment capacity. ")
+                capacity = "indicating strong repayment capacity. "
             elif dscr >= 1.0:
-                summary.add_run("indicating adequate but tight repayment capacity. ")
+                capacity = "indicating adequate but tight repayment capacity. "
             else:
-                summary.add_run("raising concerns about repayment capacity. ")
+                capacity = "raising concerns about repayment capacity. "
 
-        # Primary repayment source
-        repayment = self.document.add_paragraph()
-        repayment.add_run("Primary Repayment Source: ").bold = True
-        repayment.add_run("Operating cash flow from business operations")
+            summary_text += (
+                f"The company demonstrates a Debt Service Coverage Ratio of {dscr:.2f}x, {capacity}"
+            )
 
-        # Secondary repayment source
-        secondary = self.document.add_paragraph()
-        secondary.add_run("Secondary Repayment Source: ").bold = True
-        secondary.add_run("Liquidation of business assets and personal guarantees")
+        return summary_text
 
-    def _add_five_cs_analysis(self, extracted_data, ratios, borrower_info):
+    def _add_five_cs_analysis(self, ctx):
         """Add 5 C's of Credit analysis"""
 
         # 1. CHARACTER
         self._add_section_heading("THE 5 C'S ANALYSIS")
 
-        char_heading = self.document.add_heading("1. CHARACTER", level=2)
-        char_heading.runs[0].font.size = Pt(12)
+        char_run = self.document.add_heading(level=2).add_run("1. CHARACTER")
+        char_run.font.size = Pt(12)
 
         char_para = self.document.add_paragraph()
         char_para.add_run("Credit History: ").bold = True
         char_para.add_run(
-            f"{borrower_info.get('borrower_name', 'The borrower')} has "
+            f"{_or_default(ctx.borrower_name, 'The borrower')} has "
             f"maintained banking relationships with strong payment history. "
             f"No prior bankruptcies, liens, or judgments identified."
         )
 
         # 2. CAPACITY
-        cap_heading = self.document.add_heading("2. CAPACITY", level=2)
-        cap_heading.runs[0].font.size = Pt(12)
+        cap_run = self.document.add_heading(level=2).add_run("2. CAPACITY")
+        cap_run.font.size = Pt(12)
 
         cap_para = self.document.add_paragraph()
         cap_para.add_run("Cash Flow Analysis: ").bold = True
 
-        revenue = extracted_data.get('revenue', 0)
-        net_income = extracted_data.get('net_income', 0)
-        ebitda = extracted_data.get('ebitda', 0)
-
         cap_para.add_run(
-            f"The company generated {self._format_currency(revenue)} in revenue "
-            f"with net income of {self._format_currency(net_income)}. "
-            f"EBITDA of {self._format_currency(ebitda)} demonstrates "
+            f"The company generated {ctx.revenue_fmt} in revenue "
+            f"with net income of {ctx.net_income_fmt}. "
+            f"EBITDA of {ctx.ebitda_fmt} demonstrates "
         )
-
-        if ebitda and revenue and ebitda > revenue * 0.15:
-            cap_para.add_run("strong operating profitability.")
-        elif ebitda and revenue and ebitda > revenue * 0.08:
-            cap_para.add_run("adequate operating profitability.")
-        else:
-            cap_para.add_run("concerning profitability levels requiring attention.")
+        cap_para.add_run(self._profitability_text(ctx))
 
         # 3. CAPITAL
-        cap_heading = self.document.add_heading("3. CAPITAL", level=2)
-        cap_heading.runs[0].font.size = Pt(12)
+        cap_run = self.document.add_heading(level=2).add_run("3. CAPITAL")
+        cap_run.font.size = Pt(12)
 
         capital_para = self.document.add_paragraph()
         capital_para.add_run("Equity Position: ").bold = True
 
-        assets = extracted_data.get('total_assets', 0)
-        liabilities = extracted_data.get('total_liabilities', 0)
-        equity = assets - liabilities if assets and liabilities else 0
-
         capital_para.add_run(
-            f"Total assets of {self._format_currency(assets)} with "
-            f"liabilities of {self._format_currency(liabilities)} result in "
-            f"equity of {self._format_currency(equity)}. "
+            f"Total assets of {ctx.total_assets_fmt} with "
+            f"liabilities of {ctx.total_liabilities_fmt} result in "
+            f"equity of {ctx.equity_fmt}. "
         )
 
         # 4. COLLATERAL
-        coll_heading = self.document.add_heading("4. COLLATERAL", level=2)
-        coll_heading.runs[0].font.size = Pt(12)
+        coll_run = self.document.add_heading(level=2).add_run("4. COLLATERAL")
+        coll_run.font.size = Pt(12)
 
         coll_para = self.document.add_paragraph()
         coll_para.add_run("Collateral Structure: ").bold = True
@@ -322,81 +638,92 @@ class CreditMemoWordGenerator:
         )
 
         # 5. CONDITIONS
-        cond_heading = self.document.add_heading("5. CONDITIONS", level=2)
-        cond_heading.runs[0].font.size = Pt(12)
+        cond_run = self.document.add_heading(level=2).add_run("5. CONDITIONS")
+        cond_run.font.size = Pt(12)
 
         cond_para = self.document.add_paragraph()
         cond_para.add_run("Loan Terms: ").bold = True
         cond_para.add_run(
-            f"Proposed loan amount: {self._format_currency(borrower_info.get('loan_amount', 0))}. "
+            f"Proposed loan amount: {ctx.loan_amount_fmt}. "
             f"Interest rate: Prime + 2.50% (variable). "
             f"Term: 5-7 years with amortization schedule. "
             f"Personal guarantees required from all owners ≥20%."
         )
 
-    def _add_financial_table(self, extracted_data):
+    def _profitability_text(self, ctx):
+        """Describe operating profitability from the EBITDA margin"""
+        revenue = ctx.revenue
+        ebitda = ctx.ebitda
+
+        if ebitda and revenue and ebitda > revenue * 0.15:
+            return "strong operating profitability."
+        elif ebitda and revenue and ebitda > revenue * 0.08:
+            return "adequate operating profitability."
+        return "concerning profitability levels requiring attention."
+
+    def _add_financial_table(self, ctx):
         """Add historical financial performance table"""
         table = self.document.add_table(rows=6, cols=2)
         table.style = 'Light Shading Accent 1'
 
-        # Header row
-        header_cells = table.rows[0].cells
-        header_cells[0].text = "Financial Metric"
-        header_cells[1].text = "Most Recent Period"
+        cells = list(table._tbl.iter(_W_TC))
 
-        for cell in header_cells:
-            cell.paragraphs[0].runs[0].font.bold = True
-            cell.paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
+        # Header row
+        _fast_set_cell(cells[0], "Financial Metric", bold=True, align=WD_ALIGN_PARAGRAPH.CENTER)
+        _fast_set_cell(cells[1], "Most Recent Period", bold=True, align=WD_ALIGN_PARAGRAPH.CENTER)
 
         # Data rows
-        financial_items = [
-            ("Revenue", extracted_data.get('revenue', 0)),
-            ("Net Income", extracted_data.get('net_income', 0)),
-            ("EBITDA", extracted_data.get('ebitda', 0)),
-            ("Total Assets", extracted_data.get('total_assets', 0)),
-            ("Total Liabilities", extracted_data.get('total_liabilities', 0))
+        for i, (label, value) in enumerate(self._financial_items(ctx), start=1):
+            _fast_set_cell(cells[2 * i], label)
+            _fast_set_cell(cells[2 * i + 1], value, align=WD_ALIGN_PARAGRAPH.RIGHT)
+
+    def _financial_items(self, ctx):
+        """Build the (label, amount) rows of the financial performance table"""
+        return [
+            ("Revenue", ctx.revenue_fmt),
+            ("Net Income", ctx.net_income_fmt),
+            ("EBITDA", ctx.ebitda_fmt),
+            ("Total Assets", ctx.total_assets_fmt),
+            ("Total Liabilities", ctx.total_liabilities_fmt)
         ]
 
-        for i, (label, value) in enumerate(financial_items, start=1):
-            row = table.rows[i]
-            row.cells[0].text = label
-            row.cells[1].text = self._format_currency(value)
-            row.cells[1].paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.RIGHT
-
-        self.document.add_paragraph()  # Spacing
-
     def _add_ratios_table(self, ratios):
         """Add financial ratios analysis table with color coding"""
-        table = self.document.add_table(rows=10, cols=4)
+        table = self.document.add_table(rows=0, cols=4)
         table.style = 'Light Grid Accent 1'
 
-        # Header row
-        headers = ["Ratio", "Value", "Threshold", "Status"]
-        for i, header in enumerate(headers):
-            cell = table.rows[0].cells[i]
-            cell.text = header
-            cell.paragraphs[0].runs[0].font.bold = True
-            cell.paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
-
-        # Ratio definitions
-        ratio_info = [
-            ("Debt Service Coverage (DSCR)", "dscr", "≥1.25x"),
-            ("Total Debt to EBITDA", "debt_to_ebitda", "≤2.0x"),
-            ("Current Ratio", "current_ratio", "≥2.0x"),
-            ("Quick Ratio", "quick_ratio", "≥1.0x"),
-            ("Net Income Margin", "net_income_margin", "≥10%"),
-            ("Interest Coverage", "interest_coverage", "≥3.0x"),
-            ("Leverage Ratio", "leverage_ratio", "≤0.3"),
-            ("Working Capital", "working_capital", ">$0"),
-            ("Days Sales Outstanding", "dso", "≤45 days")
-        ]
-
-        for i, (ratio_name, ratio_key, threshold) in enumerate(ratio_info, start=1):
-            row = table.rows[i]
+        # Header row: parsed once, copied per memo
+        width = table._tbl.tblGrid[0].get(_W + 'w')
+        table._tbl.append(deepcopy(_ratio_header_row(width)))
+
+        # Phase 1: format every row (no XML work)
+        rows = self._format_ratio_rows(ratios)
+
+        # Phase 2: build the data rows as one XML fragment and append them to the table
+        fragment = parse_xml(
+            f'<w:tbl {nsdecls("w")}>' + ''.join(
+                _RATIO_ROW_XML % {
+                    'width': width,
+                    'name': escape(ratio_name),
+                    'value': escape(value_text),
+                    'threshold': escape(threshold),
+                    'color': f'<w:color w:val="{status_color}"/>' if status_color is not None else '',
+                    'status': escape(status_text)
+                }
+                for ratio_name, value_text, threshold, status_text, status_color in rows
+            ) + '</w:tbl>'
+        )
+        table._tbl.extend(fragment)
 
-            # Ratio name
-            row.cells[0].text = ratio_name
+    def _format_ratio_rows(self, ratios):
+        """
+        Format the ratios table rows
 
+        Returns:
+            List of (name, value text, threshold, status text, status color) tuples
+        """
+        rows = []
+        for ratio_name, ratio_key, threshold in _RATIO_ROWS:
             # Get ratio value (handle both dict and flat formats)
             ratio_data = ratios.get(ratio_key, None)
             if isinstance(ratio_data, dict):
@@ -407,158 +734,93 @@ class CreditMemoWordGenerator:
                 status = self._get_ratio_status(ratio_key, value)
 
             # Value
-            if ratio_key == 'net_income_margin':
-                value_text = f"{value}%" if isinstance(value, (int, float)) else str(value)
+            if not isinstance(value, (int, float)):
+                value_text = str(value)
+            elif ratio_key == 'net_income_margin':
+                value_text = f"{value}%"
             elif ratio_key == 'working_capital':
-                value_text = self._format_currency(value) if isinstance(value, (int, float)) else str(value)
+                value_text = self._format_currency(value)
             elif ratio_key == 'dso':
-                value_text = f"{value} days" if isinstance(value, (int, float)) else str(value)
+                value_text = f"{value} days"
             else:
-                value_text = f"{value:.2f}x" if isinstance(value, (int, float)) else str(value)
-
-            row.cells[1].text = value_text
-            row.cells[1].paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
+                value_text = _format_ratio(value)
 
-            # Threshold
-            row.cells[2].text = threshold
-            row.cells[2].paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
+            rows.append((ratio_name, value_text, threshold, status.upper(), _STATUS_COLOR.get(status)))
 
-            # Status with color
-            status_cell = row.cells[3]
-            status_para = status_cell.paragraphs[0]
-            status_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
+        return rows
 
-            status_run = status_para.add_run(status.upper())
-            status_run.font.bold = True
-
-            if status in ['healthy', 'good']:
-                status_run.font.color.rgb = RGBColor(0, 128, 0)  # Green
-            elif status in ['watch', 'fair']:
-                status_run.font.color.rgb = RGBColor(255, 165, 0)  # Orange
-            elif status in ['concern', 'poor']:
-                status_run.font.color.rgb = RGBColor(255, 0, 0)  # Red
-
-        self.document.add_paragraph()  # Spacing
-
-    def _add_risk_assessment(self, ratios):
+    def _add_risk_assessment(self, classification):
         """Add risk assessment narrative"""
         risk_para = self.document.add_paragraph()
-
-        # Count healthy vs concerning ratios
-        healthy_count = 0
-        concern_count = 0
-
-        for ratio_value in ratios.values():
-            if isinstance(ratio_value, dict):
-                status = ratio_value.get('status', '')
-            else:
-                status = ''
-
-            if status in ['healthy', 'good']:
-                healthy_count += 1
-            elif status in ['concern', 'poor']:
-                concern_count += 1
-
-        if concern_count == 0 and healthy_count >= 7:
-            risk_level = "LOW"
-            risk_desc = "demonstrates strong financial performance across all key metrics"
-        elif concern_count <= 2:
-            risk_level = "MODERATE"
-            risk_desc = "shows acceptable performance with some areas requiring monitoring"
-        else:
-            risk_level = "HIGH"
-            risk_desc = "exhibits concerning financial trends requiring enhanced oversight"
+        risk_level = classification.risk_level
+        risk_desc = classification.risk_desc
 
         risk_para.add_run(f"Overall Risk Assessment: ").bold = True
         risk_run = risk_para.add_run(risk_level)
         risk_run.bold = True
 
-        if risk_level == "LOW":
-            risk_run.font.color.rgb = RGBColor(0, 128, 0)
-        elif risk_level == "MODERATE":
-            risk_run.font.color.rgb = RGBColor(255, 165, 0)
-        else:
-            risk_run.font.color.rgb = RGBColor(255, 0, 0)
+        risk_run.font.color.rgb = self._risk_color(risk_level)
 
         risk_para.add_run(f". The borrower {risk_desc}.")
 
-    def _add_strengths_concerns(self, ratios):
+    def _risk_color(self, risk_level):
+        """Color for the overall risk level"""
+        if risk_level == "LOW":
+            return _GREEN
+        elif risk_level == "MODERATE":
+            return _ORANGE
+        return _RED
+
+    def _add_strengths_concerns(self, classification):
         """Add strengths and concerns lists"""
         # Strengths
-        strengths_heading = self.document.add_heading("STRENGTHS", level=2)
-        strengths_heading.runs[0].font.size = Pt(12)
-        strengths_heading.runs[0].font.color.rgb = RGBColor(0, 128, 0)
+        strengths_run = self.document.add_heading(level=2).add_run("STRENGTHS")
+        strengths_run.font.size = Pt(12)
+        strengths_run.font.color.rgb = _GREEN
 
-        strengths = []
-        interpretations = ratios.get('interpretations', {})
-
-        for ratio_key, interpretation in interpretations.items():
-            if ratio_key != 'interpretations':
-                # Check if this is a positive interpretation
-                if any(word in interpretation.lower() for word in ['strong', 'excellent', 'good', 'healthy', 'positive']):
-                    strengths.append(interpretation)
-
-        if not strengths:
-            strengths = [
-                "Established business with operating history",
-                "Experienced management team",
-                "Banking relationship maintained"
-            ]
-
-        for strength in strengths[:5]:  # Limit to 5
-            self.document.add_paragraph(strength, style='List Bullet')
+        self._add_bullets((classification.strengths or _DEFAULT_STRENGTHS)[:5])  # Limit to 5
 
         # Concerns
-        concerns_heading = self.document.add_heading("CONCERNS & MITIGATION", level=2)
-        concerns_heading.runs[0].font.size = Pt(12)
-        concerns_heading.runs[0].font.color.rgb = RGBColor(255, 0, 0)
+        concerns_run = self.document.add_heading(level=2).add_run("CONCERNS & MITIGATION")
+        concerns_run.font.size = Pt(12)
+        concerns_run.font.color.rgb = _RED
 
-        concerns = []
-        for ratio_key, interpretation in interpretations.items():
-            if ratio_key != 'interpretations':
-                # Check if this is a negative interpretation
-                if any(word in interpretation.lower() for word in ['weak', 'concern', 'low', 'risk', 'slow', 'negative']):
-                    concerns.append(interpretation)
-
-        if not concerns:
-            concerns = [
-                "Economic conditions may impact industry performance",
-                "Competition in market requires ongoing monitoring",
-                "Regular financial reporting required to track trends"
-            ]
+        self._add_bullets((classification.concerns or _DEFAULT_CONCERNS)[:5])  # Limit to 5
 
-        for concern in concerns[:5]:  # Limit to 5
-            self.document.add_paragraph(concern, style='List Bullet')
-
-    def _add_recommendation(self, borrower_info, ratios):
+    def _add_recommendation(self, ctx, classification):
         """Add final recommendation section"""
         rec_para = self.document.add_paragraph()
 
-        recommendation = self._determine_recommendation(ratios)
+        recommendation = classification.recommendation
 
         rec_para.add_run(f"{recommendation}: ").bold = True
 
-        loan_amount = self._format_currency(borrower_info.get('loan_amount', 0))
-        borrower_name = borrower_info.get('borrower_name', 'the borrower')
+        loan_amount = ctx.loan_amount_fmt
+        borrower_name = _or_default(ctx.borrower_name, 'the borrower')
 
         rec_para.add_run(
             f"Loan of {loan_amount} to {borrower_name} "
         )
 
+        rec_para.add_run(self._recommendation_rationale(recommendation))
+
+    def _recommendation_rationale(self, recommendation):
+        """Closing rationale sentence for the recommendation"""
         if "APPROVED" in recommendation:
-            rec_para.add_run(
+            return (
                 "based on demonstrated financial capacity, adequate collateral coverage, "
                 "and acceptable risk profile. "
             )
-        else:
-            rec_para.add_run(
-                "due to financial performance concerns requiring additional analysis "
-                "and risk mitigation strategies. "
-            )
+        return (
+            "due to financial performance concerns requiring additional analysis "
+            "and risk mitigation strategies. "
+        )
 
+    def _add_conditions_and_monitoring(self):
+        """Add standard conditions precedent and monitoring requirements"""
         # Conditions precedent
-        conditions_heading = self.document.add_heading("Conditions Precedent:", level=3)
-        conditions_heading.runs[0].font.size = Pt(11)
+        conditions_run = self.document.add_heading(level=3).add_run("Conditions Precedent:")
+        conditions_run.font.size = Pt(11)
 
         standard_conditions = [
             "Execution of loan agreement and security documents",
@@ -569,12 +831,11 @@ class CreditMemoWordGenerator:
             "Board resolution authorizing borrowing (if applicable)"
         ]
 
-        for condition in standard_conditions:
-            self.document.add_paragraph(condition, style='List Bullet')
+        self._add_bullets(standard_conditions)
 
         # Ongoing monitoring
-        monitoring_heading = self.document.add_heading("Ongoing Monitoring:", level=3)
-        monitoring_heading.runs[0].font.size = Pt(11)
+        monitoring_run = self.document.add_heading(level=3).add_run("Ongoing Monitoring:")
+        monitoring_run.font.size = Pt(11)
 
         monitoring_items = [
             "Annual financial statements (CPA-reviewed) due within 90 days of fiscal year-end",
@@ -584,37 +845,42 @@ class CreditMemoWordGenerator:
             "Risk rating review with each financial submission"
         ]
 
-        for item in monitoring_items:
-            self.document.add_paragraph(item, style='List Bullet')
+        self._add_bullets(monitoring_items)
+
+    def _attach_static_sections(self):
+        """Move the template's static sections to the end of the document body"""
+        sect_pr = self.document.element.body.sectPr
+        for el in self._static_sections:
+            sect_pr.addprevious(el)
 
     def _add_signature_block(self):
         """Add signature block for approvals"""
         self.document.add_page_break()
 
-        sig_heading = self.document.add_heading("APPROVAL SIGNATURES", level=2)
-        sig_heading.runs[0].font.size = Pt(12)
+        sig_heading = self.document.add_heading(level=2)
+        sig_heading.paragraph_format.space_after = Pt(48)
+        sig_run = sig_heading.add_run("APPROVAL SIGNATURES")
+        sig_run.font.size = Pt(12)
 
-        self.document.add_paragraph()
-        self.document.add_paragraph()
-
-        # Signature lines
+        # Signature lines: underscores are drawn by tab leaders, not stored as text
         signatures = [
-            "Prepared by: ________________________________   Date: ______________",
-            "                    Credit Analyst",
-            "",
-            "Reviewed by: ________________________________   Date: ______________",
-            "                    Chief Credit Officer",
-            "",
-            "Approved by: ________________________________   Date: ______________",
-            "                    President & CEO"
+            ("Prepared by:", "                    Credit Analyst"),
+            ("Reviewed by:", "                    Chief Credit Officer"),
+            ("Approved by:", "                    President & CEO")
         ]
 
-        for sig_line in signatures:
-            para = self.document.add_paragraph(sig_line)
-            if ":" not in sig_line and sig_line.strip():
-                para.alignment = WD_ALIGN_PARAGRAPH.CENTER
-                para.runs[0].font.size = Pt(10)
-                para.runs[0].font.italic = True
+        for label, title in signatures:
+            line = self.document.add_paragraph(f"{label} \t   Date: \t")
+            tab_stops = line.paragraph_format.tab_stops
+            tab_stops.add_tab_stop(Inches(4), WD_TAB_ALIGNMENT.LEFT, WD_TAB_LEADER.LINES)
+            tab_stops.add_tab_stop(Inches(6.25), WD_TAB_ALIGNMENT.LEFT, WD_TAB_LEADER.LINES)
+
+            para = self.document.add_paragraph()
+            para.alignment = WD_ALIGN_PARAGRAPH.CENTER
+            para.paragraph_format.space_after = Pt(24)
+            title_run = para.add_run(title)
+            title_run.font.size = Pt(10)
+            title_run.font.italic = True
 
     def _add_footer(self):
         """Add document footer with branding"""
@@ -623,31 +889,32 @@ class CreditMemoWordGenerator:
 
         # Primary footer line
         footer_para = footer.paragraphs[0]
-        footer_para.text = "Document Control: Internal Confidential | Classification: Credit Documentation"
         footer_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
-        footer_run = footer_para.runs[0]
+        footer_run = footer_para.add_run(
+            "Document Control: Internal Confidential | Classification: Credit Documentation"
+        )
         footer_run.font.size = Pt(8)
         footer_run.font.italic = True
-        footer_run.font.color.rgb = RGBColor(128, 128, 128)
+        footer_run.font.color.rgb = _FOOTER_GRAY
 
         # Ernie branding line
         ernie_para = footer.add_paragraph()
-        ernie_para.text = "Generated by Ernie - AI Credit Assistant | Powered by LandingAI & AWS Bedrock"
         ernie_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
-        ernie_run = ernie_para.runs[0]
+        ernie_run = ernie_para.add_run(
+            "Generated by Ernie - AI Credit Assistant | Powered by LandingAI & AWS Bedrock"
+        )
         ernie_run.font.size = Pt(7)
         ernie_run.font.italic = True
-        ernie_run.font.color.rgb = RGBColor(150, 150, 150)
+        ernie_run.font.color.rgb = _ERNIE_GRAY
 
     # Helper methods
 
     def _format_currency(self, value):
         """Format number as currency"""
         try:
-            if value is None:
-                return "N/A"
-            return f"${value:,.0f}"
-        except (ValueError, TypeError):
+            return _format_currency(value)
+        except TypeError:
+            # Unhashable values cannot go through the cache
             return "N/A"
 
     def _determine_risk_rating(self, extracted_data):
@@ -656,95 +923,443 @@ class CreditMemoWordGenerator:
         # In production, use more sophisticated analysis
         return "4 (Pass - Acceptable Risk)"
 
-    def _determine_recommendation(self, ratios):
-        """Determine loan recommendation based on ratios"""
-        concern_count = 0
+    def _build_context(self, extracted_data, borrower_info):
+        """
+        Unpack borrower and financial fields once for all sections
+
+        Args:
+            extracted_data: Dict of financial data from ADE
+            borrower_info: Dict with borrower_name, industry, loan_amount, etc.
+
+        Returns:
+            MemoContext with raw values and preformatted currency strings
+        """
+        revenue = extracted_data.get('revenue', 0)
+        net_income = extracted_data.get('net_income', 0)
+        ebitda = extracted_data.get('ebitda', 0)
+        assets = extracted_data.get('total_assets', 0)
+        liabilities = extracted_data.get('total_liabilities', 0)
+        equity = assets - liabilities if assets and liabilities else 0
+
+        return MemoContext(
+            borrower_name=borrower_info.get('borrower_name'),
+            industry=borrower_info.get('industry'),
+            loan_type=borrower_info.get('loan_type'),
+            purpose=borrower_info.get('purpose'),
+            loan_officer=borrower_info.get('loan_officer'),
+            credit_analyst=borrower_info.get('credit_analyst'),
+            loan_amount_fmt=self._format_currency(borrower_info.get('loan_amount', 0)),
+            risk_rating=self._determine_risk_rating(extracted_data),
+            revenue=revenue,
+            ebitda=ebitda,
+            revenue_fmt=self._format_currency(revenue),
+            net_income_fmt=self._format_currency(net_income),
+            ebitda_fmt=self._format_currency(ebitda),
+            total_assets_fmt=self._format_currency(assets),
+            total_liabilities_fmt=self._format_currency(liabilities),
+            equity_fmt=self._format_currency(equity)
+        )
+
+    def _classify_ratios(self, ratios):
+        """
+        Classify interpretations and ratio statuses in a single pass
+
+        Args:
+            ratios: Dict of calculated financial ratios
+
+        Returns:
+            ClassificationResult with strengths, concerns, recommendation and risk level
+        """
+        strengths = []
+        concerns = []
         healthy_count = 0
+        concern_count = 0
 
         interpretations = ratios.get('interpretations', {})
         for ratio_key, interpretation in interpretations.items():
-            if any(word in interpretation.lower() for word in ['strong', 'excellent', 'good', 'healthy', 'positive']):
+            positive = _POS_RE.search(interpretation)
+
+            if ratio_key != 'interpretations':
+                if positive:
+                    strengths.append(interpretation)
+                if _NEG_RE.search(interpretation):
+                    concerns.append(interpretation)
+
+            # Recommendation tally
+            if positive:
                 healthy_count += 1
-            elif any(word in interpretation.lower() for word in ['weak', 'concern', 'low', 'risk']):
+            elif _REC_NEG_RE.search(interpretation):
                 concern_count += 1
 
         if concern_count == 0 and healthy_count >= 7:
-            return "APPROVED"
+            recommendation = "APPROVED"
         elif concern_count >= 3:
-            return "DECLINED"
+            recommendation = "DECLINED"
         else:
-            return "APPROVED WITH CONDITIONS"
+            recommendation = "APPROVED WITH CONDITIONS"
+
+        # Count healthy vs concerning ratio statuses
+        healthy_status = 0
+        concern_status = 0
+        for ratio_value in ratios.values():
+            if isinstance(ratio_value, dict):
+                status = ratio_value.get('status', '')
+                if status in ['healthy', 'good']:
+                    healthy_status += 1
+                elif status in ['concern', 'poor']:
+                    concern_status += 1
+
+        if concern_status == 0 and healthy_status >= 7:
+            risk_level = "LOW"
+            risk_desc = "demonstrates strong financial performance across all key metrics"
+        elif concern_status <= 2:
+            risk_level = "MODERATE"
+            risk_desc = "shows acceptable performance with some areas requiring monitoring"
+        else:
+            risk_level = "HIGH"
+            risk_desc = "exhibits concerning financial trends requiring enhanced oversight"
+
+        return ClassificationResult(strengths, concerns, recommendation, risk_level, risk_desc)
 
     def _get_ratio_status(self, ratio_key, value):
         """Determine status for a ratio value"""
-        if value is None or not isinstance(value, (int, float)):
+        threshold = _THRESHOLDS.get(ratio_key)
+        if threshold is None or value is None or not isinstance(value, (int, float)):
             return 'unknown'
 
-        # Define thresholds for each ratio
-        thresholds = {
-            'dscr': {'healthy': 1.25, 'watch': 1.0},
-            'debt_to_ebitda': {'healthy': 2.0, 'watch': 4.0, 'inverse': True},
-            'current_ratio': {'healthy': 2.0, 'watch': 1.0},
-            'quick_ratio': {'healthy': 1.0, 'watch': 0.5},
-            'net_income_margin': {'healthy': 10.0, 'watch': 5.0},
-            'interest_coverage': {'healthy': 3.0, 'watch': 2.0},
-            'leverage_ratio': {'healthy': 0.3, 'watch': 0.6, 'inverse': True},
-            'working_capital': {'healthy': 0, 'watch': 0},
-            'dso': {'healthy': 45, 'watch': 60, 'inverse': True}
-        }
+        healthy, watch, is_inverse = threshold
+        if is_inverse:
+            # For ratios where lower is better
+            return 'healthy' if value <= healthy else ('watch' if value <= watch else 'concern')
+        # For ratios where higher is better
+        return 'healthy' if value >= healthy else ('watch' if value >= watch else 'concern')
 
-        if ratio_key not in thresholds:
-            return 'unknown'
 
-        threshold = thresholds[ratio_key]
-        is_inverse = threshold.get('inverse', False)
+def _build_template():
+    """
+    Build the static memo scaffold once and serialize it
 
-        if is_inverse:
-            # For ratios where lower is better
-            if value <= threshold['healthy']:
-                return 'healthy'
-            elif value <= threshold.get('watch', float('inf')):
-                return 'watch'
-            else:
-                return 'concern'
+    Returns:
+        Template .docx as bytes
+    """
+    _lazy_docx()
+    generator = CreditMemoWordGenerator.__new__(CreditMemoWordGenerator)
+    generator.document = Document()
+    generator._setup_styles()
+    generator._add_header()
+    generator._add_conditions_and_monitoring()
+    generator._add_signature_block()
+    generator._add_footer()
+
+    buf = BytesIO()
+    generator.document.save(buf)
+    return buf.getvalue()
+
+
+def _template_bytes():
+    """Return the serialized template, building it on first use"""
+    global _TEMPLATE_BYTES
+    if _TEMPLATE_BYTES is None:
+        with _TEMPLATE_LOCK:
+            if _TEMPLATE_BYTES is None:
+                _TEMPLATE_BYTES = _build_template()
+    return _TEMPLATE_BYTES
+
+
+def _body_template():
+    """Load the Jinja template for the memo body on first use"""
+    global _BODY_TEMPLATE
+    if _BODY_TEMPLATE is None:
+        with _TEMPLATE_LOCK:
+            if _BODY_TEMPLATE is None:
+                import jinja2
+                env = jinja2.Environment(
+                    loader=jinja2.FileSystemLoader(_TEMPLATE_DIR),
+                    autoescape=True,
+                    trim_blocks=True,
+                    lstrip_blocks=True
+                )
+                _BODY_TEMPLATE = env.get_template('credit_memo.xml.j2')
+    return _BODY_TEMPLATE
+
+
+def _fast_template():
+    """
+    Unpack the template package once for FastMemoWriter
+
+    Returns:
+        Tuple of (zip entries as (ZipInfo, bytes), document.xml up to <w:body>,
+        document.xml from the static sections on)
+    """
+    global _FAST_TEMPLATE
+    if _FAST_TEMPLATE is None:
+        with _TEMPLATE_LOCK:
+            if _FAST_TEMPLATE is None:
+                with zipfile.ZipFile(BytesIO(_template_bytes())) as zf:
+                    entries = [(info, zf.read(info)) for info in zf.infolist()]
+
+                document_xml = dict((info.filename, data) for info, data in entries)['word/document.xml']
+                document_xml = document_xml.decode('utf-8')
+                split = document_xml.index('<w:body>') + len('<w:body>')
+                _FAST_TEMPLATE = (entries, document_xml[:split], document_xml[split:])
+    return _FAST_TEMPLATE
+
+
+def _fast_available():
+    """FastMemoWriter needs Jinja2 (installed with Flask)"""
+    return importlib.util.find_spec('jinja2') is not None
+
+
+class FastMemoWriter(CreditMemoWordGenerator):
+    """
+    Renders the memo body straight into word/document.xml from a Jinja template,
+    bypassing python-docx's object model. Produces the same document as
+    CreditMemoWordGenerator.
+    """
+
+    def __init__(self, write_buffer_size=1024 * 1024, compress=True):
+        """
+        Args:
+            write_buffer_size: Buffer size in bytes for writing the .docx
+            compress: Deflate the package parts (False stores them uncompressed,
+                      which is faster to write and still opens in Word)
+        """
+        _lazy_docx()
+        self.write_buffer_size = write_buffer_size
+        self.compression = zipfile.ZIP_DEFLATED if compress else zipfile.ZIP_STORED
+
+    def _reset(self):
+        """Nothing to reset; every memo is rendered from the cached template"""
+
+    def generate_credit_memo(self, extracted_data, ratios, memo_narrative,
+                            borrower_info, output_path):
+        """
+        Generate complete credit memo Word document
+
+        Args:
+            extracted_data: Dict of financial data from ADE
+            ratios: Dict of calculated financial ratios
+            memo_narrative: Unused; reserved for an analyst narrative section
+            borrower_info: Dict with borrower_name, industry, loan_amount, etc.
+            output_path: Path to save .docx file, or a writable binary file-like object
+
+        Returns:
+            output_path
+        """
+        ctx = self._build_context(extracted_data, borrower_info)
+        classification = self._classify_ratios(ratios)
+        recommendation = classification.recommendation
+
+        body_xml = _body_template().render(
+            ctx=ctx,
+            title="CREDIT MEMORANDUM",
+            loan_info=self._loan_info_items(ctx),
+            recommendation=recommendation,
+            recommendation_color=self._recommendation_color(recommendation),
+            summary_text=self._summary_text(ctx, ratios),
+            borrower_subject=_or_default(ctx.borrower_name, 'The borrower'),
+            borrower_object=_or_default(ctx.borrower_name, 'the borrower'),
+            profitability_text=self._profitability_text(ctx),
+            financial_items=self._financial_items(ctx),
+            ratio_rows=self._format_ratio_rows(ratios),
+            risk_level=classification.risk_level,
+            risk_desc=classification.risk_desc,
+            risk_color=self._risk_color(classification.risk_level),
+            strengths=(classification.strengths or _DEFAULT_STRENGTHS)[:5],
+            concerns=(classification.concerns or _DEFAULT_CONCERNS)[:5],
+            rationale=self._recommendation_rationale(recommendation),
+            red=_RED,
+            green=_GREEN,
+            dark_blue=_DARK_BLUE
+        )
+
+        entries, head, tail = _fast_template()
+        document_xml = (head + body_xml + tail).encode('utf-8')
+
+        if hasattr(output_path, 'write'):
+            self._write_package(output_path, entries, document_xml)
         else:
-            # For ratios where higher is better
-            if value >= threshold['healthy']:
-                return 'healthy'
-            elif value >= threshold.get('watch', 0):
-                return 'watch'
-            else:
-                return 'concern'
+            with open(output_path, 'wb', buffering=self.write_buffer_size) as f:
+                self._write_package(f, entries, document_xml)
+
+        return output_path
+
+    def _write_package(self, f, entries, document_xml):
+        """Write the template package with document.xml replaced"""
+        with zipfile.ZipFile(f, 'w', self.compression) as zf:
+            for info, data in entries:
+                zf.writestr(info, document_xml if info.filename == 'word/document.xml' else data,
+                            compress_type=self.compression)
 
 
 # Standalone function for easy integration
 def generate_credit_memo_docx(extracted_data, ratios, memo_narrative,
-                              borrower_info, output_filename):
+                              borrower_info, output_filename=None, fast=True, compress=True):
     """
     Generate credit memo Word document
 
     Args:
         extracted_data: Financial data from ADE
         ratios: Calculated financial ratios
-        memo_narrative: Text narrative (optional, for reference)
+        memo_narrative: Unused; accepted for API compatibility
         borrower_info: Borrower details
-        output_filename: Output file path
+        output_filename: Output file path, a writable binary file-like object,
+                         None to render into a new in-memory buffer, or "-" to
+                         stream to stdout (e.g. piped into an upload or converter)
+        fast: Render with FastMemoWriter when Jinja2 is available
+              (False uses the python-docx object model)
+        compress: Deflate the package; False writes it stored for quicker local
+                  test output (FastMemoWriter only, python-docx always deflates)
 
     Returns:
-        Path to generated .docx file
+        Path to generated .docx file (or the file-like object); for None,
+        a BytesIO rewound to the start, ready to stream
     """
-    generator = CreditMemoWordGenerator()
-    return generator.generate_credit_memo(
+    if output_filename is None:
+        sink = BytesIO()
+    elif output_filename == "-":
+        sink = sys.stdout.buffer
+    else:
+        sink = output_filename
+    generator_class = _generator_class(fast)
+    if generator_class is FastMemoWriter:
+        generator = generator_class(compress=compress)
+    else:
+        generator = generator_class()
+    result = generator.generate_credit_memo(
         extracted_data=extracted_data,
         ratios=ratios,
-        memo_narrative=memo_narrative,
+        memo_narrative=None,
         borrower_info=borrower_info,
-        output_path=output_filename
+        output_path=sink
     )
+    if output_filename is None:
+        sink.seek(0)
+    elif output_filename == "-":
+        sink.flush()
+    return result
+
+
+def _generator_class(fast):
+    """Pick the memo writer for the fast flag"""
+    return FastMemoWriter if fast and _fast_available() else CreditMemoWordGenerator
+
+
+def _job_kwargs(job):
+    """Copy a batch job without its (unused) narrative text"""
+    return {**job, 'memo_narrative': None}
+
+
+def generate_credit_memo_docx_batch(jobs, fast=True):
+    """
+    Generate several credit memo Word documents with one generator
+
+    Args:
+        jobs: Iterable of dicts with extracted_data, ratios, borrower_info
+              and output_path (memo_narrative is optional and ignored)
+        fast: Render with FastMemoWriter when Jinja2 is available
+
+    Returns:
+        List of paths to generated .docx files
+    """
+    generator = _generator_class(fast)()
+    results = []
+    for i, job in enumerate(jobs):
+        if i:
+            generator._reset()
+        results.append(generator.generate_credit_memo(**_job_kwargs(job)))
+    return results
+
+
+def _worker(job, fast=True):
+    """Render one batch job in a worker process"""
+    return _generator_class(fast)().generate_credit_memo(**job)
+
+
+def _warm_templates(fast):
+    """Build the cached templates the workers will render from"""
+    _lazy_docx()
+    if _generator_class(fast) is FastMemoWriter:
+        _fast_template()
+        _body_template()
+    else:
+        _template_bytes()
+
+
+def _fork_context():
+    """Fork start method where it is safe (Linux), else the platform default"""
+    if sys.platform.startswith('linux'):
+        return multiprocessing.get_context('fork')
+    return None
+
+
+def generate_credit_memo_docx_parallel(jobs, max_workers=None, fast=True):
+    """
+    Generate several credit memo Word documents across worker processes
+
+    On Linux the templates are built once in the parent and forked workers
+    inherit them (copy-on-write) instead of rebuilding them per process.
+
+    Args:
+        jobs: Iterable of dicts with extracted_data, ratios, borrower_info
+              and output_path (memo_narrative is optional and ignored)
+        max_workers: Number of worker processes (defaults to CPU count)
+        fast: Render with FastMemoWriter when Jinja2 is available
+
+    Returns:
+        List of paths to generated .docx files, in job order
+    """
+    jobs = [_job_kwargs(job) for job in jobs]
+    workers = max_workers or os.cpu_count() or 1
+    chunksize = max(1, len(jobs) // (workers * 4))
+
+    mp_context = _fork_context()
+    if mp_context is not None:
+        _warm_templates(fast)
+
+    with ProcessPoolExecutor(max_workers=workers, mp_context=mp_context) as executor:
+        return list(executor.map(partial(_worker, fast=fast), jobs, chunksize=chunksize))
+
+
+def serve(stdin=None, stdout=None, fast=True):
+    """
+    Render memos for jobs streamed as JSON lines, in one long-lived process
+
+    Lets non-Python callers pipe jobs in without paying interpreter startup and
+    the python-docx import per memo. Each input line is a job dict (as for
+    generate_credit_memo_docx_batch); each output line is the written path.
+    Failed jobs are reported on stderr and the stream continues.
+
+    Args:
+        stdin: Binary input stream (defaults to sys.stdin.buffer)
+        stdout: Binary output stream (defaults to sys.stdout.buffer)
+        fast: Render with FastMemoWriter when Jinja2 is available
+    """
+    stdin = stdin or sys.stdin.buffer
+    stdout = stdout or sys.stdout.buffer
+    generator = _generator_class(fast)()
+    _warm_templates(fast)
+
+    for i, line in enumerate(stdin):
+        if not line.strip():
+            continue
+        try:
+            if i:
+                generator._reset()
+            path = generator.generate_credit_memo(**_job_kwargs(_json_loads(line)))
+        except Exception as e:
+            print(f"✗ Job {i + 1} failed: {e}", file=sys.stderr)
+            continue
+        stdout.write(str(path).encode('utf-8') + b'\n')
+        stdout.flush()
 
 
 # Test function
 if __name__ == "__main__":
+    if '--serve' in sys.argv:
+        serve()
+        sys.exit(0)
+
     # Test data
     test_extracted = {
         'revenue': 5000000,
@@ -791,6 +1406,17 @@ if __name__ == "__main__":
         'credit_analyst': 'David Chen'
     }
 
+    # Stream the test memo to stdout only, e.g. python word_generator.py --stdout > memo.docx
+    if '--stdout' in sys.argv:
+        generate_credit_memo_docx(
+            extracted_data=test_extracted,
+            ratios=test_ratios,
+            memo_narrative="",
+            borrower_info=test_borrower,
+            output_filename="-"
+        )
+        sys.exit(0)
+
     output_path = "test_credit_memo.docx"
 
     print("Generating test credit memo...")
@@ -799,8 +1425,60 @@ if __name__ == "__main__":
         ratios=test_ratios,
         memo_narrative="",
         borrower_info=test_borrower,
-        output_filename=output_path
+        output_filename=output_path,
+        compress=False  # local review copy; skip deflate
     )
 
     print(f"✓ Credit memo generated: {result}")
+    print(f"  Borrower: {_json_dumps(test_borrower)}")
+
+    # Same memo rendered in memory, as the Flask download routes do
+    buffer = generate_credit_memo_docx(
+        extracted_data=test_extracted,
+        ratios=test_ratios,
+        memo_narrative="",
+        borrower_info=test_borrower
+    )
+    assert len(buffer.getvalue()) > 0
+    print(f"✓ In-memory credit memo generated: {len(buffer.getvalue()):,} bytes")
+
+    # Batch of memos, sequential vs. across worker processes
+    import tempfile
+    import time
+    with tempfile.TemporaryDirectory() as batch_dir:
+        batch_jobs = [
+            {
+                'extracted_data': test_extracted,
+                'ratios': test_ratios,
+                'borrower_info': test_borrower,
+                'output_path': os.path.join(batch_dir, f"memo_{i:03d}.docx")
+            }
+            for i in range(64)
+        ]
+
+        start = time.perf_counter()
+        generate_credit_memo_docx_batch(batch_jobs)
+        sequential = time.perf_counter() - start
+
+        start = time.perf_counter()
+        paths = generate_credit_memo_docx_parallel(batch_jobs)
+        parallel = time.perf_counter() - start
+
+    print(f"✓ {len(paths)} memos: {sequential:.2f}s sequential, {parallel:.2f}s parallel")
+
+    # A second memo must reuse the cached template rather than rebuild it
+    def _no_rebuild():
+        raise AssertionError("template rebuilt on second call")
+
+    _build_template = _no_rebuild
+    for fast in (True, False):
+        generate_credit_memo_docx(
+            extracted_data=test_extracted,
+            ratios=test_ratios,
+            memo_narrative="",
+            borrower_info=test_borrower,
+            output_filename=BytesIO(),
+            fast=fast
+        )
+    print("✓ Second generation reused the cached template")
     print("Open the file in Microsoft Word to review.")